@@ -1,50 +1,85 @@
-from flask import Flask, render_template
-import sqlite3
-from config import DATABASE
+from datetime import datetime
+from flask import Flask, render_template, jsonify
+from database.db import init_app
+from config import MAX_CONTENT_LENGTH, RESUME_WORKERS, SWEEP_INTERVAL_SECONDS, WARM_UP
+from database.migrations import migrate
+from services import resume_worker, sweeper, warmup
 
 from routes.auth_routes import auth_bp
 from routes.admin_routes import admin_bp
 from routes.applicant_routes import applicant_bp
 from routes.company_routes import company_bp
 
-app = Flask(__name__)
-app.secret_key = "ascendpro_secret"
-
 # ===============================
-# CONTEXT PROCESSOR
+# TEMPLATE FILTERS
 # ===============================
-@app.context_processor
-def inject_pending_count():
-    pending_count = 0
-    try:
-        with sqlite3.connect(DATABASE, timeout=10) as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM users WHERE approved = 0")
-            pending_count = cur.fetchone()[0]
-    except Exception:
-        pending_count = 0
-
-    return dict(pending_count=pending_count)
+def format_timestamp(ts, fmt="%d %b %Y, %H:%M"):
+    """Unix seconds (e.g. applications.applied_ts) as a readable date."""
+    if not ts:
+        return "—"
+    return datetime.fromtimestamp(ts).strftime(fmt)
 
 # ===============================
-# REGISTER BLUEPRINTS
+# HOME PAGE
 # ===============================
-app.register_blueprint(auth_bp)
-app.register_blueprint(admin_bp, url_prefix="/admin")
-app.register_blueprint(applicant_bp, url_prefix="/applicant")
+def index():
+    return render_template("index.html")
 
-# IMPORTANT FIX HERE 👇
-app.register_blueprint(company_bp)
+# ===============================
+# READINESS
+# ===============================
+def ready():
+    """200 once this worker has warmed up (services/warmup.py), 503 before."""
+    status = warmup.status()
+    return jsonify(status), 200 if status["ready"] else 503
 
 # ===============================
-# HOME PAGE
+# APP FACTORY
 # ===============================
-@app.route("/")
-def index():
-    return render_template("index.html")
+def create_app():
+    app = Flask(__name__)
+    app.secret_key = "ascendpro_secret"
+
+    # Oversized uploads are refused with 413 before any parsing happens
+    app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
+
+    # Bring the schema up to date before serving (database/migrations.py)
+    migrate()
+
+    # One shared connection per request, closed at teardown (database/db.py)
+    init_app(app)
+
+    app.add_template_filter(format_timestamp, "timestamp")
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(admin_bp, url_prefix="/admin")
+    app.register_blueprint(applicant_bp, url_prefix="/applicant")
+
+    # IMPORTANT FIX HERE 👇
+    app.register_blueprint(company_bp)
+
+    app.add_url_rule("/", "index", index)
+    app.add_url_rule("/ready", "ready", ready)
+
+    # 🔥 Load NLP models and the job index now, not in the first request
+    if WARM_UP:
+        warmup.start()
+
+    # 📄 Parse queued uploads, including any left over from before a restart
+    if RESUME_WORKERS:
+        resume_worker.start()
+
+    # 🧹 Reclaim orphaned rows and files in the background
+    if SWEEP_INTERVAL_SECONDS:
+        sweeper.start()
+
+    return app
+
 
 # ===============================
 # RUN SERVER
+# Importing this module has no side effects; servers build the app
+# through wsgi.py ("gunicorn wsgi:app") or "flask --app app:create_app run"
 # ===============================
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
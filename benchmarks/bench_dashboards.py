@@ -0,0 +1,182 @@
+"""
+Dashboard query latency: the single queries in models.stats_model
+against the per-figure COUNT queries they replaced.
+
+    python benchmarks/bench_dashboards.py [--applications N] [--repeat N]
+
+Builds a throwaway database (100k applications by default) with the
+current migrations, checks both versions return the same figures, then
+reports the median time per dashboard render.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+STATUSES = ("Applied", "Applied", "Applied", "Shortlisted", "Rejected", "Accepted")
+JOB_TYPES = ("Full-time", "Part-time", "Internship", "Remote")
+
+
+# ══════════════════════════════════════════════════════════════════
+# QUERIES AS THEY WERE
+# ══════════════════════════════════════════════════════════════════
+
+def legacy_admin(cur):
+    cur.execute("SELECT COUNT(*) FROM users")
+    total_users = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM users WHERE approved = 0")
+    pending_users = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM jobs")
+    active_jobs = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM users WHERE role = 'company'")
+    companies = cur.fetchone()[0]
+    cur.execute("SELECT role, COUNT(*) FROM users GROUP BY role")
+    roles = dict(cur.fetchall())
+    return (total_users, pending_users, active_jobs,
+            roles.get("admin", 0), companies, roles.get("applicant", 0))
+
+
+def legacy_company(cur, company_id):
+    cur.execute("SELECT COUNT(*) FROM jobs WHERE company_id = ?", (company_id,))
+    active_jobs = cur.fetchone()[0]
+    cur.execute("""
+        SELECT COUNT(*) FROM applications
+        WHERE job_id IN (SELECT id FROM jobs WHERE company_id = ?)
+    """, (company_id,))
+    total_applicants = cur.fetchone()[0]
+    cur.execute("""
+        SELECT COUNT(*) FROM applications
+        WHERE status = 'Shortlisted'
+        AND job_id IN (SELECT id FROM jobs WHERE company_id = ?)
+    """, (company_id,))
+    shortlisted = cur.fetchone()[0]
+    return (active_jobs, total_applicants, shortlisted)
+
+
+def legacy_applicant(cur, user_id):
+    cur.execute("SELECT job_type FROM user_preferences WHERE user_id = ?", (user_id,))
+    pref = cur.fetchone()
+    cur.execute("SELECT COUNT(*) FROM applications WHERE user_id = ?", (user_id,))
+    total = cur.fetchone()[0]
+    cur.execute("""
+        SELECT COUNT(*) FROM applications
+        WHERE user_id = ? AND status = 'Shortlisted'
+    """, (user_id,))
+    shortlisted = cur.fetchone()[0]
+    cur.execute("""
+        SELECT COUNT(*) FROM applications
+        WHERE user_id = ? AND status = 'Accepted'
+    """, (user_id,))
+    accepted = cur.fetchone()[0]
+    return (total, shortlisted, accepted, pref[0] if pref else None)
+
+
+# ══════════════════════════════════════════════════════════════════
+# DATA
+# ══════════════════════════════════════════════════════════════════
+
+def seed(conn, applications, rng):
+    companies  = max(10, applications // 200)
+    applicants = max(100, applications // 5)
+    jobs       = companies * 10
+
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT INTO users (name, email, password, role, approved) VALUES (?, ?, 'x', ?, ?)",
+        [(f"admin{i}", f"admin{i}@example.com", "admin", 1) for i in range(3)]
+        + [(f"company{i}", f"company{i}@example.com", "company", rng.random() < 0.9)
+           for i in range(companies)]
+        + [(f"applicant{i}", f"applicant{i}@example.com", "applicant", rng.random() < 0.8)
+           for i in range(applicants)]
+    )
+    company_ids   = list(range(4, 4 + companies))
+    applicant_ids = list(range(4 + companies, 4 + companies + applicants))
+
+    cur.executemany(
+        "INSERT INTO jobs (role, description, company_id, type) VALUES (?, ?, ?, ?)",
+        [(f"Role {i}", "", company_ids[i % companies], rng.choice(JOB_TYPES))
+         for i in range(jobs)]
+    )
+    cur.executemany(
+        "INSERT INTO user_preferences (user_id, job_type) VALUES (?, ?)",
+        [(user_id, rng.choice(JOB_TYPES)) for user_id in applicant_ids if rng.random() < 0.5]
+    )
+
+    pairs = set()
+    while len(pairs) < applications:
+        pairs.add((rng.choice(applicant_ids), rng.randint(1, jobs)))
+    cur.executemany(
+        "INSERT INTO applications (user_id, job_id, status) VALUES (?, ?, ?)",
+        [(user_id, job_id, rng.choice(STATUSES)) for user_id, job_id in pairs]
+    )
+    conn.commit()
+    return company_ids, applicant_ids
+
+
+def median_ms(fn, args_list, repeat):
+    times = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app's connection helper at the throwaway database
+        import config
+        config.DATABASE = os.path.join(tmp, "bench.db")
+
+        from database.db import get_db
+        from database.migrations import migrate
+        from models.stats_model import (admin_dashboard_stats, applicant_dashboard_stats,
+                                        company_dashboard_stats)
+
+        migrate(config.DATABASE)
+        conn = get_db()
+        rng  = random.Random(42)
+        company_ids, applicant_ids = seed(conn, args.applications, rng)
+        conn.execute("ANALYZE")
+
+        companies  = [(company_id,) for company_id in rng.sample(company_ids, 20)]
+        applicants = [(user_id,) for user_id in rng.sample(applicant_ids, 50)]
+        cur = conn.cursor()
+
+        # Same figures from both versions
+        stats = admin_dashboard_stats()
+        assert tuple(stats.get(name, 0) for name in (
+            "users", "pending_users", "jobs", "users:admin", "users:company", "users:applicant"
+        )) == legacy_admin(cur)
+        for company_id, in companies:
+            assert tuple(company_dashboard_stats(company_id)) == legacy_company(cur, company_id)
+        for user_id, in applicants:
+            assert tuple(applicant_dashboard_stats(user_id)) == legacy_applicant(cur, user_id)
+
+        print(f"{args.applications} applications, {len(company_ids)} companies, "
+              f"{len(applicant_ids)} applicants\n")
+        print(f"{'dashboard':<12}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+        for name, legacy, current, calls in (
+            ("admin",     legacy_admin,     admin_dashboard_stats,     [()]),
+            ("company",   legacy_company,   company_dashboard_stats,   companies),
+            ("applicant", legacy_applicant, applicant_dashboard_stats, applicants),
+        ):
+            before = median_ms(lambda *a: legacy(cur, *a), calls, args.repeat)
+            after  = median_ms(current, calls, args.repeat)
+            print(f"{name:<12}{before:>14.3f}{after:>14.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput and memory of the PDF backends in nlp.resume_parser.
+
+    python benchmarks/bench_pdf_extract.py [--repeat N] [--workers N] [PDF ...]
+
+Defaults to every PDF in uploads/. Each backend runs in a fresh
+subprocess so its peak RSS is measured without the others' imports.
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def run_backend(backend, paths, repeat, workers):
+    import resource
+    from nlp.resume_parser import extract_pdf_pages
+
+    # Import and warm the backend before measuring
+    extract_pdf_pages(paths[0], backend, workers=1)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    pages = chars = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            text   = extract_pdf_pages(path, backend, workers=workers)
+            pages += len(text)
+            chars += sum(len(page) for page in text)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"pages": pages, "chars": chars, "seconds": elapsed,
+            "peak_rss_mb": peak / 1024, "extra_rss_mb": (peak - baseline) / 1024}
+
+
+def main():
+    from nlp.resume_parser import PDF_BACKENDS
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(ROOT, "uploads", "*.pdf")))
+    if not paths:
+        sys.exit("No PDFs to benchmark")
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, paths, args.repeat, args.workers)))
+        return
+
+    print(f"{len(paths)} PDFs x {args.repeat} runs, workers={args.workers}\n")
+    print(f"{'backend':<12} {'pages/s':>9} {'MB text/s':>10} {'peak RSS MB':>12} {'extra RSS MB':>13}")
+    for backend in PDF_BACKENDS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, "--repeat", str(args.repeat),
+             "--workers", str(args.workers), *paths],
+            capture_output=True, text=True, check=True
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{backend:<12} {r['pages'] / r['seconds']:>9.1f} "
+              f"{r['chars'] / r['seconds'] / 1e6:>10.2f} "
+              f"{r['peak_rss_mb']:>12.1f} {r['extra_rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
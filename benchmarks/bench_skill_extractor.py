@@ -0,0 +1,137 @@
+"""
+Micro-benchmark: nlp.skill_extractor.extract_skills (taxonomy trie)
+against the NLTK tokenizer version it replaced, and against scanning
+the text once per taxonomy phrase, on generated resumes of increasing
+size.
+
+    python benchmarks/bench_skill_extractor.py
+
+Also prints which skills each version finds in a sample resume.
+"""
+import os
+import random
+import re
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import nltk
+
+from nlp.skill_extractor import get_matcher, load_taxonomy
+
+
+def legacy_extract_skills(text, tokenize=nltk.word_tokenize):
+    """The extractor as it was before the taxonomy matcher."""
+    stop_words = {
+        "and","or","the","is","to","in","of","for","with","a","an","on"
+    }
+
+    words = tokenize(text.lower())
+
+    skill_set = [
+        "python", "java", "sql", "flask", "django",
+        "html", "css", "javascript",
+        "machine learning", "ai"
+    ]
+
+    skills = [w for w in words if w in skill_set and w not in stop_words]
+    return list(set(skills))
+
+
+def legacy_tokenizer():
+    """word_tokenize needs the punkt model; fall back to its word splitter."""
+    try:
+        nltk.word_tokenize("probe.")
+        return nltk.word_tokenize
+    except LookupError:
+        print("(punkt not installed: legacy timings use NLTKWordTokenizer "
+              "without sentence splitting, which flatters them)\n")
+        return nltk.tokenize.NLTKWordTokenizer().tokenize
+
+
+def taxonomy_phrases():
+    matcher = load_taxonomy()
+    phrases = []
+
+    def walk(node, words):
+        for key, child in node.items():
+            if key is None:
+                phrases.append((" ".join(words), child))
+            else:
+                walk(child, words + [key])
+
+    walk(matcher._trie, [])
+    return phrases
+
+
+def per_phrase_extractor(phrases):
+    """The obvious way to grow the list: one word-boundary regex per phrase."""
+    patterns = [(re.compile(r"(?<![\w+#])" + r"\W+".join(map(re.escape, p.split())) + r"(?![\w+#])"),
+                 canonical) for p, canonical in phrases]
+
+    def extract(text):
+        text = text.lower()
+        return list({canonical: None for pattern, canonical in patterns if pattern.search(text)})
+
+    return extract
+
+
+SAMPLE = """
+Jane Doe - Senior Software Engineer
+Skills: Python, Django, Flask, JavaScript (ES6), React.js, Node.js, SQL,
+PostgreSQL, machine learning, scikit-learn, NLP, Docker, K8s, AWS, CI/CD.
+Built REST APIs and data pipelines in PySpark; led A/B testing and
+deep learning work with PyTorch. Strong communication and leadership.
+"""
+
+FILLER = (
+    "the a team with and for of to in on project client product system "
+    "led managed developed designed increased reduced improved delivered "
+    "experience education university degree customers revenue 15% 2019 "
+    "worked on built shipped owned scaled migrated tested documented"
+).split()
+
+
+def make_resume(words, rng, skills):
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(FILLER))
+    return " ".join(out)
+
+
+def main():
+    tokenize = legacy_tokenizer()
+
+    start   = time.perf_counter()
+    matcher = load_taxonomy()
+    print(f"taxonomy: {matcher.phrases} phrases compiled in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    phrases   = taxonomy_phrases()
+    per_phrase = per_phrase_extractor(phrases)
+    new       = get_matcher().extract
+
+    print("sample resume")
+    print("  legacy    :", sorted(legacy_extract_skills(SAMPLE, tokenize)))
+    print("  taxonomy  :", sorted(new(SAMPLE)))
+    assert sorted(new(SAMPLE)) == sorted(per_phrase(SAMPLE))
+    print()
+
+    rng    = random.Random(42)
+    skills = [p for p, _ in phrases]
+
+    print(f"{'words':>8} {'legacy ms':>10} {'per-phrase ms':>14} {'trie ms':>9} {'vs legacy':>10}")
+    for words in (500, 5000, 50000):
+        text = make_resume(words, rng, skills)
+        runs = max(1, 20000 // words)
+        t_legacy = min(timeit.repeat(lambda: legacy_extract_skills(text, tokenize), number=runs, repeat=5)) / runs
+        t_phrase = min(timeit.repeat(lambda: per_phrase(text), number=1, repeat=3))
+        t_trie   = min(timeit.repeat(lambda: new(text), number=runs, repeat=5)) / runs
+        print(f"{words:>8} {t_legacy * 1000:>10.3f} {t_phrase * 1000:>14.3f} "
+              f"{t_trie * 1000:>9.3f} {t_legacy / t_trie:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Worker startup cost: how long "import app" takes in a fresh interpreter,
+measured with python -X importtime, and which heavy libraries it pulls
+in. numpy/scipy/scikit-learn, python-docx/lxml, NLTK and the PDF
+backends are only needed by a few routes and must stay lazy.
+
+    python benchmarks/bench_startup.py [--repeat N] [--top N] [--max-ms MS]
+
+Exits non-zero if any of HEAVY is imported at startup, or if the best
+of --repeat runs is slower than --max-ms.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEAVY = ("numpy", "scipy", "sklearn", "docx", "lxml", "nltk",
+         "pypdfium2", "PyPDF2", "pdfplumber")
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+# Importing app only defines create_app(): no migration, warm-up or
+# sweeper thread runs, so this measures exactly what a worker imports.
+PROBE = (
+    "import sys, app; "
+    f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+)
+
+
+def import_app():
+    """(cumulative us per top-level module, heavy modules loaded) for one cold start."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    modules = []
+    for line in result.stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            # One space before a top-level name, two more per nesting level
+            depth = (len(m.group(3)) + 1) // 2
+            modules.append((m.group(4), int(m.group(2)), depth))
+    # The probe's answer is its last line of output
+    lines = result.stdout.strip().splitlines() or [""]
+    heavy = [name for name in lines[-1].split(",") if name]
+    return app_subtree(modules), heavy
+
+
+def app_subtree(modules):
+    """
+    The "app" entry and everything imported under it. importtime prints
+    children before their parent, so that is the run of deeper entries
+    just above the top-level "app" line.
+    """
+    end = next(i for i, (name, _, depth) in enumerate(modules) if name == "app" and depth == 1)
+    start = end
+    while start > 0 and modules[start - 1][2] > 1:
+        start -= 1
+    return modules[start:end + 1]
+
+
+def import_paths(modules, max_depth=3):
+    """(cumulative us, "routes.x > nlp.y") for entries up to max_depth below app."""
+    paths = []
+    for i, (name, us, depth) in enumerate(modules):
+        if not 2 <= depth <= max_depth:
+            continue
+        chain, want = [name], depth - 1
+        for parent, _, parent_depth in modules[i + 1:]:
+            if want < 2:
+                break
+            if parent_depth == want:
+                chain.insert(0, parent)
+                want -= 1
+        paths.append((us, " > ".join(chain)))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if import app takes longer than this")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        modules, heavy = import_app()
+        total = next(us for name, us, depth in modules if name == "app" and depth == 1)
+        runs.append((total, modules, heavy))
+    total, modules, heavy = min(runs, key=lambda run: run[0])
+
+    # What app imports, and what those import, slowest first
+    print(f"slowest imports under app (best of {args.repeat}, cumulative ms)")
+    for us, path in sorted(import_paths(modules), reverse=True)[:args.top]:
+        print(f"  {us / 1000:>9.1f}  {path}")
+
+    print(f"\nimport app: {total / 1000:.1f} ms "
+          f"(median {sorted(r[0] for r in runs)[len(runs) // 2] / 1000:.1f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: imported at startup: {', '.join(heavy)}")
+        failed = True
+    else:
+        print(f"ok: none of {', '.join(HEAVY)} imported at startup")
+
+    if args.max_ms is not None and total / 1000 > args.max_ms:
+        print(f"FAIL: {total / 1000:.1f} ms is over --max-ms {args.max_ms:.0f}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
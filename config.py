@@ -4,3 +4,88 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 DATABASE = os.path.join(BASE_DIR, "database", "ascendpro.db")
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "uploads", "resumes")
+
+# Persistent TF-IDF index over the jobs table (see nlp/job_matcher.py)
+JOB_INDEX_DIR = os.path.join(BASE_DIR, "database", "job_index")
+
+# Ranked job recommendations: default and maximum number of jobs returned
+RECOMMENDED_JOBS_LIMIT = 20
+RECOMMENDED_JOBS_MAX = 100
+
+# Content-addressed cache of parsed uploads (see models/resume_cache.py)
+RESUME_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESUME_CACHE_MAX_ENTRIES = 5000
+
+# Process pools (resume parsing, PDF page extraction, PDF export) start
+# their workers with this method. Not "fork": app processes run several
+# threads, and a forked child inherits whatever locks and SQLite
+# connections they hold at that moment
+POOL_START_METHOD = "forkserver"
+
+# Background resume parsing (see services/resume_worker.py): every app
+# process starts a dispatcher that claims queued and stale uploads, also
+# those left over from before a restart. 0 leaves them to other processes
+RESUME_SPOOL_FOLDER = os.path.join(BASE_DIR, "uploads", "pending")
+RESUME_WORKERS = 2
+RESUME_WORKER_POLL_SECONDS = 5
+RESUME_WORKER_STALE_SECONDS = 600
+
+# PDF text extraction (see nlp/resume_parser.py): backend is one of
+# "pypdfium2", "pypdf2" or "pdfplumber"; documents with at least
+# PDF_PARALLEL_MIN_PAGES pages are split across PDF_PAGE_WORKERS processes
+PDF_BACKEND = "pypdfium2"
+PDF_PAGE_WORKERS = 4
+PDF_PARALLEL_MIN_PAGES = 16
+
+# Rendered resume downloads, one DOCX and/or PDF per resume
+# (see services/resume_docx.py and services/resume_pdf.py)
+DOCX_CACHE_DIR = os.path.join(BASE_DIR, "uploads", "docx_cache")
+
+# PDF export runs in a process pool: worker processes, how many more
+# renders may wait for them, and how long a request waits for its render
+PDF_RENDER_WORKERS = 2
+PDF_RENDER_QUEUE = 8
+PDF_RENDER_TIMEOUT = 30
+
+# Uploaded resumes and rendered downloads live under UPLOADS_ROOT and are
+# served by services/downloads.py. SENDFILE_MODE hands the transfer to the
+# front proxy once a request is authorised: "x-sendfile" (Apache
+# mod_xsendfile, lighttpd) or "x-accel-redirect" (nginx, with an internal
+# location mapping SENDFILE_URL_PREFIX onto UPLOADS_ROOT). None streams
+# the file from Python.
+UPLOADS_ROOT = os.path.join(BASE_DIR, "uploads")
+SENDFILE_MODE = None
+SENDFILE_URL_PREFIX = "/protected-uploads/"
+
+# Uploaded files, stored once per content under BLOB_STORE_DIR/ab/cd/<sha256>
+# (see services/blob_store.py); unreferenced blobs are deleted once they
+# have been untouched for BLOB_GC_GRACE_SECONDS
+BLOB_STORE_DIR = os.path.join(UPLOADS_ROOT, "blobs")
+BLOB_GC_GRACE_SECONDS = 3600
+
+# Background sweeper (see services/sweeper.py): every SWEEP_INTERVAL_SECONDS
+# one app process removes orphaned rows, unreferenced blobs and stale files,
+# at most SWEEP_BATCH rows per write transaction, and logs what it
+# reclaimed; the last SWEEP_HISTORY runs are shown at /admin/maintenance.
+# None turns the background thread off.
+SWEEP_INTERVAL_SECONDS = 900
+SWEEP_BATCH = 500
+SWEEP_HISTORY = 50
+
+# Uploads: requests larger than this are rejected with 413 before parsing
+MAX_CONTENT_LENGTH = 10 * 1024 * 1024
+
+# List pages (keyset pagination, see database/pagination.py): default and
+# maximum rows per page, overridable per request with ?per_page=
+LIST_PAGE_SIZE = 25
+LIST_PAGE_SIZE_MAX = 100
+
+# Skill taxonomy for nlp/skill_extractor.py: "canonical | alias | ..." per line
+SKILL_TAXONOMY = os.path.join(BASE_DIR, "nlp", "data", "skills.txt")
+
+# /applicant/jobs?match=skills: default minimum number of shared skills
+SKILL_MATCH_MIN = 3
+
+# Load the skill taxonomy, job index and docx in a background thread when
+# the app is created (see services/warmup.py); /ready answers 503 until done
+WARM_UP = True
@@ -0,0 +1,168 @@
+"""
+Fails if a route query would scan a whole table.
+
+Runs EXPLAIN QUERY PLAN for every query in QUERIES against a freshly
+migrated database (or the one given on the command line) and exits
+non-zero when a plan contains a bare "SCAN <table>", i.e. a full table
+scan with no index. Queries are imported from the modules that run
+them, and every statement in every trigger is checked as well; add a
+new query's constant or page builder to QUERIES alongside the index
+that serves it in database/migrations.py.
+
+    python -m database.check_query_plans [path/to/db]
+"""
+import os
+import re
+import sys
+import tempfile
+
+from database.db import connect
+from database.migrations import migrate
+from models import skill_model, stats_model, user_model
+from routes import admin_routes, applicant_routes, auth_routes, company_routes
+from services import blob_store, resume_worker, sweeper
+
+# Sample cursors and filters for the page builders; every optional
+# condition is switched on so each one shows up in a plan
+AFTER_ID, AFTER_TS, AFTER_SCORE = (100,), (1700000000, 100), (-100, 0)
+SINCE, UNTIL, SIZE = 1600000000, 1700000000, 25
+
+_company_filter = company_routes.applications_filter(1, "Applied", 1, None)
+_skills_filter  = company_routes.applications_filter(1, "", None, ["python", "sql"])
+
+# (where it runs, sql, params, full scan expected). The sql is the
+# module constant or page builder the code itself runs, so a change to
+# a query is checked without touching this list.
+QUERIES = [
+    # ── auth ──────────────────────────────────────────────────────
+    ("auth.login", user_model.LOGIN_SQL, ("a@b.c", "x"), False),
+    ("auth.company_session", auth_routes.COMPANY_DETAILS_SQL, (1,), False),
+
+    # ── admin ─────────────────────────────────────────────────────
+    ("admin.pending_count", stats_model.STAT_SQL, ("pending_users",), False),
+    # Reads every counter row on purpose; stats holds a handful of rows
+    ("admin.dashboard", stats_model.ALL_STATS_SQL, (), True),
+    ("admin.pending_users",
+     *admin_routes.pending_users_query("applicant", AFTER_ID, SIZE), False),
+    ("admin.companies", admin_routes.COMPANIES_SQL, (), False),
+    ("admin.verify_company", admin_routes.VERIFY_COMPANY_SQL, (1,), False),
+    ("admin.company_job_ids", admin_routes.COMPANY_JOB_IDS_SQL, (1,), False),
+    ("admin.users page",
+     *admin_routes.users_query("applicant", "pending", AFTER_ID, SIZE), False),
+    ("admin.jobs page",
+     *admin_routes.jobs_query("", None, None, AFTER_TS, SIZE), False),
+    ("admin.jobs page by type",
+     *admin_routes.jobs_query("Internship", SINCE, UNTIL, AFTER_TS, SIZE), False),
+    ("admin.applications page",
+     *admin_routes.applications_query("Shortlisted", None, None, None, AFTER_ID, SIZE), False),
+
+    # ── applicant ─────────────────────────────────────────────────
+    ("applicant.dashboard", stats_model.APPLICANT_DASHBOARD_SQL, (1, 1), False),
+    ("applicant.save_preference", applicant_routes.CLEAR_PREFERENCE_SQL, (1,), False),
+    ("applicant.jobs page",
+     *applicant_routes.jobs_page_query("Full-Time", AFTER_TS, SIZE), False),
+    # Reads only the matching rows through the FTS5 index
+    ("applicant.search_jobs",
+     *applicant_routes.search_jobs_query('"pyth"*', "Full-Time", AFTER_SCORE, SIZE), False),
+    ("applicant.latest_resume_id", skill_model.LATEST_RESUME_ID_SQL, (1,), False),
+    ("applicant.skill_matched_jobs", skill_model.JOBS_MATCHING_RESUME_SQL, (1, 3, 20), False),
+    ("applicant.ranked_jobs resume", applicant_routes.LATEST_RESUME_SQL, (1,), False),
+    ("applicant.apply built resumes", applicant_routes.BUILT_RESUMES_SQL, (1,), False),
+    ("applicant.apply already applied", applicant_routes.ALREADY_APPLIED_SQL, (1, 1), False),
+
+    # ── company ───────────────────────────────────────────────────
+    ("company.dashboard", stats_model.COMPANY_DASHBOARD_SQL, (1,), False),
+    ("company.profile", company_routes.PROFILE_SQL, (1,), False),
+    ("company.applications",
+     *company_routes.applications_query(*_company_filter, AFTER_ID, SIZE), False),
+    ("company.applications by skills",
+     *company_routes.applications_query(*_skills_filter, None, SIZE), False),
+    ("company.search_applications",
+     *company_routes.search_applications_query('"machine learning" AND "flask"*',
+                                               *_company_filter, AFTER_SCORE, SIZE), False),
+    ("company.view_resume", company_routes.VIEW_RESUME_SQL, (1, 1), False),
+    ("company.ranked_applications", company_routes.RANKED_APPLICATIONS_SQL, ("role", 1), False),
+
+    # ── blob store ────────────────────────────────────────────────
+    ("blob_store.collect_garbage", blob_store.GARBAGE_SQL, (1700000000, 500), False),
+
+    # ── sweeper ───────────────────────────────────────────────────
+    *[(f"sweeper.orphaned {table}", sweeper.orphan_ids_sql(table, orphaned), (0, 500), False)
+      for table, orphaned in sweeper.ORPHANS],
+    *[(f"sweeper.delete orphan {table}", sweeper.delete_orphan_sql(table, orphaned), (1,), False)
+      for table, orphaned in sweeper.ORPHANS],
+    # Newest rows by rowid; sweep_runs is pruned to SWEEP_HISTORY rows
+    ("sweeper.claim", sweeper.LAST_RUN_SQL, (), True),
+    ("sweeper.recent_runs", sweeper.RECENT_RUNS_SQL, (50,), True),
+    ("sweeper.live renders", sweeper.live_resumes_sql(3), (1, 2, 3), False),
+
+    # ── resume worker ─────────────────────────────────────────────
+    ("resume_worker.claim", resume_worker.CLAIM_SQL, (2,), False),
+]
+
+# Trigger bodies run on every write to their table, so each statement in
+# them is checked too, read back from the migrated schema with NEW.x /
+# OLD.x standing in as parameters.
+TRIGGER_BODY_RE = re.compile(r'\bBEGIN\b(.*)\bEND\s*$', re.S | re.I)
+ROW_REF_RE      = re.compile(r'\b(?:NEW|OLD)\.\w+', re.I)
+
+
+def trigger_queries(conn):
+    """(label, sql, params, False) for every statement in every trigger."""
+    queries = []
+    for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name"):
+        body = TRIGGER_BODY_RE.search(sql)
+        statements = [part for part in (body.group(1).split(";") if body else ()) if part.strip()]
+        for number, statement in enumerate(statements, 1):
+            statement, refs = ROW_REF_RE.subn("?", statement)
+            queries.append((f"trigger {name} #{number}", statement, (1,) * refs, False))
+    return queries
+
+
+# "SCAN jobs" is a full table scan; "SCAN jobs USING COVERING INDEX ..."
+# only walks an index and is fine for counts. Scans of a subquery's
+# result ("SCAN listed") read rows already narrowed down and are fine too.
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)$')
+
+
+def full_scans(conn, sql, params):
+    """Tables the plan for sql reads without any index."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [m.group(1) for m in (FULL_SCAN_RE.match(row[3]) for row in rows)
+            if m and m.group(1) in tables]
+
+
+def check(database):
+    migrate(database)
+    conn = connect(database)
+    failures = 0
+    try:
+        for label, sql, params, scan_expected in QUERIES + trigger_queries(conn):
+            scans = full_scans(conn, sql, params)
+            if scans and not scan_expected:
+                failures += 1
+                print(f"FULL SCAN  {label}: {', '.join(scans)}")
+            else:
+                print(f"ok         {label}")
+    finally:
+        conn.close()
+    return failures
+
+
+def main(argv):
+    if len(argv) > 1:
+        failures = check(argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check(os.path.join(tmp, "plans.db"))
+
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} fall back to a full table scan")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
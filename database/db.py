@@ -0,0 +1,58 @@
+import sqlite3
+import threading
+
+from flask import g, has_app_context
+
+from config import DATABASE
+
+# Applied to every new connection. WAL lets readers run alongside the one
+# writer, and busy_timeout makes writers wait for the lock instead of
+# failing straight away with "database is locked".
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 10000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Compiled statements kept per connection by the sqlite3 module
+CACHED_STATEMENTS = 256
+
+_local = threading.local()
+
+
+def connect(database=DATABASE):
+    """Open a new tuned connection; rows support both row[0] and row["name"]."""
+    conn = sqlite3.connect(database, timeout=10, cached_statements=CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_db():
+    """
+    Shared connection for the current request, opened on first use and
+    closed by close_db() at app context teardown. Code running outside an
+    app context (the resume worker threads) gets one connection per thread.
+    """
+    if has_app_context():
+        if "db" not in g:
+            g.db = connect()
+        return g.db
+
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = connect()
+    return conn
+
+
+def close_db(exc=None):
+    conn = g.pop("db", None)
+    if conn is not None:
+        conn.close()
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
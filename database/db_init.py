@@ -1,36 +1,10 @@
-import sqlite3
+"""
+Create or upgrade the database at config.DATABASE.
 
-conn = sqlite3.connect("ascendpro.db")
-cur = conn.cursor()
+    python -m database.db_init
+"""
+from config import DATABASE
+from database.migrations import migrate
 
-cur.execute("""
-CREATE TABLE IF NOT EXISTS users (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT,
-    email TEXT,
-    password TEXT,
-    role TEXT
-)
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS jobs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    title TEXT,
-    description TEXT,
-    company TEXT
-)
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS applications (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER,
-    job_id INTEGER,
-    status TEXT
-)
-""")
-
-conn.commit()
-conn.close()
-print("Database initialized")
+version = migrate()
+print(f"Database initialized: {DATABASE} (schema version {version})")
@@ -0,0 +1,805 @@
+import json
+import os
+import sys
+
+from config import DATABASE, RESUME_SPOOL_FOLDER, UPLOADS_ROOT
+from database.db import connect
+from nlp.skill_extractor import extract_skills
+from services import blob_store
+
+# ══════════════════════════════════════════════════════════════════
+# SCHEMA MIGRATIONS
+#
+# The schema version lives in PRAGMA user_version. Every entry of
+# MIGRATIONS brings the database from version N to N + 1 inside one
+# transaction, so a failed step leaves the previous version intact.
+# Append new steps at the end; never edit a step that has shipped.
+# ══════════════════════════════════════════════════════════════════
+
+
+# ======================================
+# HELPERS
+# ======================================
+def _columns(cur, table):
+    cur.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cur.fetchall()}
+
+
+def _add_column(cur, table, column, definition):
+    if column not in _columns(cur, table):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _has_index_on(cur, table, column):
+    """True if some index on table (incl. UNIQUE constraints) starts with column."""
+    cur.execute(f"PRAGMA index_list({table})")
+    for index in [row[1] for row in cur.fetchall()]:
+        cur.execute(f"PRAGMA index_info({index})")
+        first = cur.fetchone()
+        if first and first[2] == column:
+            return True
+    return False
+
+
+# ======================================
+# 1 – BASE TABLES
+# Older databases were created by hand or by the first db_init.py, so
+# tables are created if missing and columns added if missing.
+# ======================================
+def _001_base_tables(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            name       TEXT,
+            email      TEXT UNIQUE,
+            password   TEXT,
+            role       TEXT,
+            approved   INTEGER DEFAULT 0,
+            created_at DATETIME
+        )
+    """)
+    _add_column(cur, "users", "approved", "INTEGER DEFAULT 0")
+    _add_column(cur, "users", "created_at", "DATETIME")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            role         TEXT,
+            description  TEXT,
+            company      TEXT,
+            company_id   INTEGER,
+            company_name TEXT,
+            vacancy      INTEGER,
+            type         TEXT,
+            salary       TEXT,
+            experience   TEXT,
+            created_at   TEXT
+        )
+    """)
+    for column, definition in (("role", "TEXT"), ("company_id", "INTEGER"),
+                               ("company_name", "TEXT"), ("vacancy", "INTEGER"),
+                               ("type", "TEXT"), ("salary", "TEXT"),
+                               ("experience", "TEXT"), ("created_at", "TEXT")):
+        _add_column(cur, "jobs", column, definition)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS applications (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id         INTEGER,
+            job_id          INTEGER,
+            status          TEXT,
+            resume_filename TEXT,
+            full_name       TEXT,
+            email           TEXT,
+            phone           TEXT,
+            education       TEXT,
+            cover_letter    TEXT
+        )
+    """)
+    for column in ("resume_filename", "full_name", "email", "phone",
+                   "education", "cover_letter"):
+        _add_column(cur, "applications", column, "TEXT")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS notifications (
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            message TEXT
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resumes (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id   INTEGER,
+            content   TEXT,
+            ats_score INTEGER DEFAULT 0
+        )
+    """)
+    _add_column(cur, "resumes", "ats_score", "INTEGER DEFAULT 0")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS company_details (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id      INTEGER,
+            company_name TEXT,
+            industry     TEXT,
+            website      TEXT,
+            location     TEXT,
+            description  TEXT,
+            verified     INTEGER DEFAULT 0,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id       INTEGER,
+            job_type      TEXT,
+            location_type TEXT,
+            created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+# ======================================
+# 2 – RESUME ANALYSIS
+# ======================================
+def _002_resume_analysis(cur):
+    # Per-category ATS points + feedback (JSON), see nlp/ats_scorer.ATSResult
+    _add_column(cur, "resumes", "ats_breakdown", "TEXT")
+
+    # Background parsing queue: uploads wait in resumes with status 'pending'
+    # until services/resume_worker.py has extracted and scored them
+    _add_column(cur, "resumes", "skills", "TEXT")
+    _add_column(cur, "resumes", "status", "TEXT DEFAULT 'done'")
+    _add_column(cur, "resumes", "source_path", "TEXT")
+    _add_column(cur, "resumes", "source_sha256", "TEXT")
+    _add_column(cur, "resumes", "claimed_at", "REAL")
+    _add_column(cur, "resumes", "error", "TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_status ON resumes(status)")
+
+    # Parse results keyed on the SHA-256 of uploaded bytes, see models/resume_cache.py
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_cache (
+            sha256        TEXT PRIMARY KEY,
+            content       TEXT,
+            skills        TEXT,
+            ats_score     INTEGER,
+            ats_breakdown TEXT,
+            size          INTEGER,
+            last_used     REAL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resume_cache_last_used ON resume_cache(last_used)")
+
+
+# ======================================
+# 3 – LOOKUP INDEXES
+# One per WHERE / JOIN column the routes filter on; checked by
+# database/check_query_plans.py.
+# ======================================
+def _003_lookup_indexes(cur):
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_users_approved ON users(approved)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)")
+    # Databases created with "email TEXT UNIQUE" already have one
+    if not _has_index_on(cur, "users", "email"):
+        cur.execute("CREATE INDEX idx_users_email ON users(email)")
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON jobs(company_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_type ON jobs(type)")
+
+    # Double submits left duplicate applications behind; keep the first one.
+    # Rows missing a user or job are not duplicates of each other (GROUP BY
+    # would lump their NULLs together) and the unique index allows them.
+    cur.execute("""
+        DELETE FROM applications
+        WHERE user_id IS NOT NULL AND job_id IS NOT NULL
+          AND id NOT IN (
+            SELECT MIN(id) FROM applications
+            WHERE user_id IS NOT NULL AND job_id IS NOT NULL
+            GROUP BY user_id, job_id
+        )
+    """)
+    cur.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_user_job
+        ON applications(user_id, job_id)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_applications_job_status
+        ON applications(job_id, status)
+    """)
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_company_details_user_id ON company_details(user_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_user_preferences_user_id ON user_preferences(user_id)")
+
+
+# ======================================
+# 4 – STATS COUNTERS
+# Named counters kept current by triggers, so hot paths read one row
+# instead of counting. Read through models/stats_model.py.
+# ======================================
+def _004_stats_counters(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS stats (
+            name  TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Users waiting for admin approval (the admin sidebar badge)
+    cur.execute("""
+        INSERT OR REPLACE INTO stats (name, value)
+        SELECT 'pending_users', COUNT(*) FROM users WHERE approved = 0
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_pending_insert
+        AFTER INSERT ON users WHEN NEW.approved = 0
+        BEGIN
+            UPDATE stats SET value = value + 1 WHERE name = 'pending_users';
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_pending_delete
+        AFTER DELETE ON users WHEN OLD.approved = 0
+        BEGIN
+            UPDATE stats SET value = value - 1 WHERE name = 'pending_users';
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_pending_update
+        AFTER UPDATE OF approved ON users
+        BEGIN
+            UPDATE stats
+            SET value = value + IFNULL(NEW.approved = 0, 0) - IFNULL(OLD.approved = 0, 0)
+            WHERE name = 'pending_users';
+        END
+    """)
+
+
+# ======================================
+# 5 – DASHBOARD COUNTERS
+# Totals for the admin dashboard: 'users', 'users:<role>' and 'jobs'.
+# ======================================
+def _005_dashboard_counters(cur):
+    cur.execute("""
+        INSERT OR REPLACE INTO stats (name, value)
+        SELECT 'users', COUNT(*) FROM users
+    """)
+    cur.execute("""
+        INSERT OR REPLACE INTO stats (name, value)
+        SELECT 'users:' || IFNULL(role, ''), COUNT(*) FROM users GROUP BY role
+    """)
+    cur.execute("""
+        INSERT OR REPLACE INTO stats (name, value)
+        SELECT 'jobs', COUNT(*) FROM jobs
+    """)
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_insert
+        AFTER INSERT ON users
+        BEGIN
+            INSERT OR IGNORE INTO stats (name, value) VALUES ('users:' || IFNULL(NEW.role, ''), 0);
+            UPDATE stats SET value = value + 1
+            WHERE name IN ('users', 'users:' || IFNULL(NEW.role, ''));
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_delete
+        AFTER DELETE ON users
+        BEGIN
+            UPDATE stats SET value = value - 1
+            WHERE name IN ('users', 'users:' || IFNULL(OLD.role, ''));
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_role
+        AFTER UPDATE OF role ON users WHEN NEW.role IS NOT OLD.role
+        BEGIN
+            INSERT OR IGNORE INTO stats (name, value) VALUES ('users:' || IFNULL(NEW.role, ''), 0);
+            UPDATE stats SET value = value - 1 WHERE name = 'users:' || IFNULL(OLD.role, '');
+            UPDATE stats SET value = value + 1 WHERE name = 'users:' || IFNULL(NEW.role, '');
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_count_insert
+        AFTER INSERT ON jobs
+        BEGIN
+            UPDATE stats SET value = value + 1 WHERE name = 'jobs';
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_count_delete
+        AFTER DELETE ON jobs
+        BEGIN
+            UPDATE stats SET value = value - 1 WHERE name = 'jobs';
+        END
+    """)
+
+
+# ======================================
+# 6 – SORTABLE TIMESTAMPS
+# Unix-second columns that list pages order and filter on directly
+# (ORDER BY datetime(created_at) could not use an index). Jobs from
+# before this migration without a parsable date get 0; applications
+# from before it have no recorded date at all and stay NULL, listed as
+# "—" and not matched by date filters.
+# ======================================
+def _006_sortable_timestamps(cur):
+    _add_column(cur, "jobs", "created_ts", "INTEGER")
+    cur.execute("""
+        UPDATE jobs
+        SET created_ts = IFNULL(CAST(strftime('%s', created_at) AS INTEGER), 0)
+        WHERE created_ts IS NULL
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_created_ts
+        AFTER INSERT ON jobs WHEN NEW.created_ts IS NULL
+        BEGIN
+            UPDATE jobs
+            SET created_ts = CAST(strftime('%s', 'now') AS INTEGER),
+                created_at = IFNULL(NEW.created_at, datetime('now'))
+            WHERE id = NEW.id;
+        END
+    """)
+
+    _add_column(cur, "applications", "applied_ts", "INTEGER")
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_applications_applied_ts
+        AFTER INSERT ON applications WHEN NEW.applied_ts IS NULL
+        BEGIN
+            UPDATE applications
+            SET applied_ts = CAST(strftime('%s', 'now') AS INTEGER)
+            WHERE id = NEW.id;
+        END
+    """)
+
+    # Keyset order for the job lists, with and without a type filter;
+    # (type, created_ts) also serves plain type lookups
+    cur.execute("DROP INDEX IF EXISTS idx_jobs_type")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_type_created ON jobs(type, created_ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_ts)")
+
+    # Status filter on the admin applications list
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status)")
+
+
+# ======================================
+# 7 – JOB SEARCH
+# External-content FTS5 index over jobs: the text lives only in jobs,
+# jobs_fts holds the inverted index. Queried by database/search.py.
+# ======================================
+def _007_jobs_search(cur):
+    # prefix= indexes 2- and 3-letter prefixes so "py*" style queries
+    # do not walk the whole term list
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            role, description, company_name,
+            content='jobs', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+
+    # External content tables must be told the old values on delete,
+    # so updates are a delete of the old row followed by an insert
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_fts_insert
+        AFTER INSERT ON jobs
+        BEGIN
+            INSERT INTO jobs_fts (rowid, role, description, company_name)
+            VALUES (NEW.id, NEW.role, NEW.description, NEW.company_name);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_fts_delete
+        AFTER DELETE ON jobs
+        BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, role, description, company_name)
+            VALUES ('delete', OLD.id, OLD.role, OLD.description, OLD.company_name);
+        END
+    """)
+    # Only the indexed columns: the created_ts trigger updates every new
+    # row and must not reindex it
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_fts_update
+        AFTER UPDATE OF role, description, company_name ON jobs
+        BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, role, description, company_name)
+            VALUES ('delete', OLD.id, OLD.role, OLD.description, OLD.company_name);
+            INSERT INTO jobs_fts (rowid, role, description, company_name)
+            VALUES (NEW.id, NEW.role, NEW.description, NEW.company_name);
+        END
+    """)
+
+    cur.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+# ======================================
+# 8 – CANDIDATE SEARCH
+# One FTS5 row per application (rowid = applications.id): what the
+# applicant typed into the form plus the text of their latest parsed
+# resume, the same text the candidate ranking falls back on. The
+# resume text comes from another table, so unlike jobs_fts this index
+# keeps its own copy of the text.
+# ======================================
+_LATEST_RESUME_SQL = """
+    (SELECT content FROM resumes
+     WHERE resumes.user_id = {user_id} AND resumes.status = 'done'
+     ORDER BY resumes.id DESC LIMIT 1)
+"""
+
+
+def _008_candidate_search(cur):
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+            full_name, education, cover_letter, resume,
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+
+    # ── applications ──────────────────────────────────────────────
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_insert
+        AFTER INSERT ON applications
+        BEGIN
+            INSERT INTO candidates_fts (rowid, full_name, education, cover_letter, resume)
+            VALUES (NEW.id, NEW.full_name, NEW.education, NEW.cover_letter,
+                    {_LATEST_RESUME_SQL.format(user_id="NEW.user_id")});
+        END
+    """)
+    # Status changes are by far the most common update and touch no text
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_update
+        AFTER UPDATE OF full_name, education, cover_letter, user_id ON applications
+        BEGIN
+            UPDATE candidates_fts
+            SET full_name    = NEW.full_name,
+                education    = NEW.education,
+                cover_letter = NEW.cover_letter,
+                resume       = {_LATEST_RESUME_SQL.format(user_id="NEW.user_id")}
+            WHERE rowid = NEW.id;
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_delete
+        AFTER DELETE ON applications
+        BEGIN
+            DELETE FROM candidates_fts WHERE rowid = OLD.id;
+        END
+    """)
+
+    # ── resumes ───────────────────────────────────────────────────
+    # Any change to a parsed resume re-resolves the applicant's latest
+    # one and copies it into each of their applications. Pending and
+    # processing rows from the resume worker are skipped until done.
+    for name, event, row, when in (
+            ("insert", "INSERT", "NEW", "NEW.status = 'done'"),
+            ("update", "UPDATE OF content, status", "NEW",
+             "NEW.status = 'done' OR OLD.status = 'done'"),
+            ("delete", "DELETE", "OLD", "OLD.status = 'done'")):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_resume_{name}
+            AFTER {event} ON resumes WHEN {when}
+            BEGIN
+                UPDATE candidates_fts
+                SET resume = {_LATEST_RESUME_SQL.format(user_id=f"{row}.user_id")}
+                WHERE rowid IN (SELECT id FROM applications WHERE user_id = {row}.user_id);
+            END
+        """)
+
+    cur.execute(f"""
+        INSERT INTO candidates_fts (rowid, full_name, education, cover_letter, resume)
+        SELECT id, full_name, education, cover_letter,
+               {_LATEST_RESUME_SQL.format(user_id="applications.user_id")}
+        FROM applications
+        WHERE id NOT IN (SELECT rowid FROM candidates_fts)
+    """)
+
+
+# ======================================
+# 9 – SKILLS
+# Normalised skills: resumes.skills and jobs.skills (JSON lists of
+# canonical names from nlp/skill_extractor.py) are mirrored by triggers
+# into resume_skills / job_skills. Both are keyed (skill_id, owner) so
+# "who has skill X" is an index range, and set intersections over
+# several skills never read any text. Queried by models/skill_model.py.
+# ======================================
+def _skill_names_sql(column):
+    # json_each() raises on malformed JSON; treat it as "no skills"
+    return f"""
+        SELECT DISTINCT lower(value) AS name
+        FROM json_each(CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END)
+        WHERE type = 'text'
+    """
+
+
+def _skill_link_table(cur, owner, table, link_table, link_column):
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {link_table} (
+            skill_id      INTEGER NOT NULL,
+            {link_column} INTEGER NOT NULL,
+            PRIMARY KEY (skill_id, {link_column})
+        ) WITHOUT ROWID
+    """)
+    cur.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{link_table}_{owner}
+        ON {link_table}({link_column}, skill_id)
+    """)
+
+    sync = f"""
+        INSERT OR IGNORE INTO skills (name) {_skill_names_sql("NEW.skills")};
+        INSERT OR IGNORE INTO {link_table} (skill_id, {link_column})
+        SELECT skills.id, NEW.id
+        FROM ({_skill_names_sql("NEW.skills")}) AS listed
+        JOIN skills ON skills.name = listed.name;
+    """
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{link_table}_insert
+        AFTER INSERT ON {table} WHEN NEW.skills IS NOT NULL
+        BEGIN {sync} END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{link_table}_update
+        AFTER UPDATE OF skills ON {table}
+        BEGIN
+            DELETE FROM {link_table} WHERE {link_column} = OLD.id;
+            {sync}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{link_table}_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {link_table} WHERE {link_column} = OLD.id;
+        END
+    """)
+
+
+def _009_skills(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id   INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    _add_column(cur, "jobs", "skills", "TEXT")
+
+    _skill_link_table(cur, "resume", "resumes", "resume_skills", "resume_id")
+    _skill_link_table(cur, "job", "jobs", "job_skills", "job_id")
+
+    # Stored skill lists so far came from a ten-word list; re-extract
+    # them with the taxonomy. The UPDATEs fill the link tables.
+    cur.execute("""
+        SELECT id, content FROM resumes
+        WHERE status = 'done' AND content IS NOT NULL AND content != ''
+    """)
+    cur.executemany("UPDATE resumes SET skills = ? WHERE id = ?",
+                    [(json.dumps(extract_skills(content)), resume_id)
+                     for resume_id, content in cur.fetchall()])
+
+    cur.execute("SELECT sha256, content FROM resume_cache WHERE content IS NOT NULL")
+    cur.executemany("UPDATE resume_cache SET skills = ? WHERE sha256 = ?",
+                    [(json.dumps(extract_skills(content)), sha256)
+                     for sha256, content in cur.fetchall()])
+
+    cur.execute("SELECT id, role, description FROM jobs")
+    cur.executemany("UPDATE jobs SET skills = ? WHERE id = ?",
+                    [(json.dumps(extract_skills(f"{role or ''} {description or ''}")), job_id)
+                     for job_id, role, description in cur.fetchall()])
+
+
+# ======================================
+# 10 – BLOB STORE
+# Uploaded files move into the content-addressed store
+# (services/blob_store.py). blobs.refs counts the applications.resume_blob
+# and resumes.source_blob values naming each blob, so identical uploads
+# share one file and unreferenced files can be collected. Files already
+# in uploads/ are imported here by hard link; the old names are removed
+# by step 11, once this step has committed.
+# ======================================
+def _blob_ref_triggers(cur, table, column):
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{column}_insert
+        AFTER INSERT ON {table} WHEN NEW.{column} IS NOT NULL
+        BEGIN
+            UPDATE blobs SET refs = refs + 1 WHERE sha256 = NEW.{column};
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{column}_delete
+        AFTER DELETE ON {table} WHEN OLD.{column} IS NOT NULL
+        BEGIN
+            UPDATE blobs SET refs = refs - 1 WHERE sha256 = OLD.{column};
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{column}_update
+        AFTER UPDATE OF {column} ON {table} WHEN OLD.{column} IS NOT NEW.{column}
+        BEGIN
+            UPDATE blobs SET refs = refs - 1 WHERE sha256 = OLD.{column};
+            UPDATE blobs SET refs = refs + 1 WHERE sha256 = NEW.{column};
+        END
+    """)
+
+
+def _010_blob_store(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            sha256     TEXT PRIMARY KEY,
+            size       INTEGER NOT NULL,
+            refs       INTEGER NOT NULL DEFAULT 0,
+            touched_ts INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    # Only unreferenced blobs are ever looked up by age (garbage collection)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_blobs_unreferenced
+        ON blobs(touched_ts) WHERE refs = 0
+    """)
+
+    _add_column(cur, "applications", "resume_blob", "TEXT")
+    _add_column(cur, "resumes", "source_blob", "TEXT")
+    _blob_ref_triggers(cur, "applications", "resume_blob")
+    _blob_ref_triggers(cur, "resumes", "source_blob")
+
+    cur.execute("""
+        SELECT id, resume_filename FROM applications
+        WHERE resume_filename IS NOT NULL AND resume_blob IS NULL
+    """)
+    for app_id, filename in cur.fetchall():
+        path = os.path.join(UPLOADS_ROOT, filename)
+        if os.path.isfile(path):
+            sha256 = blob_store.put_file(cur, path)
+            cur.execute("UPDATE applications SET resume_blob = ? WHERE id = ?", (sha256, app_id))
+
+    # Queued uploads still waiting in the spool folder
+    cur.execute("""
+        SELECT id, source_path FROM resumes
+        WHERE source_path IS NOT NULL AND source_blob IS NULL
+    """)
+    for resume_id, path in cur.fetchall():
+        if os.path.isfile(path):
+            sha256 = blob_store.put_file(cur, path)
+            cur.execute("UPDATE resumes SET source_blob = ?, source_path = ? WHERE id = ?",
+                        (sha256, blob_store.blob_path(sha256), resume_id))
+
+
+# ======================================
+# 11 – REMOVE LEGACY UPLOADS
+# Drops the uploads/ and spool names of files step 10 imported. Only
+# files whose content matches their blob are removed.
+# ======================================
+def _011_remove_legacy_uploads(cur):
+    cur.execute("""
+        SELECT resume_filename, resume_blob FROM applications
+        WHERE resume_blob IS NOT NULL
+    """)
+    legacy = [(os.path.join(UPLOADS_ROOT, filename), sha256)
+              for filename, sha256 in cur.fetchall()]
+
+    if os.path.isdir(RESUME_SPOOL_FOLDER):
+        # Spool files are named "<sha256>.<ext>"
+        legacy += [(os.path.join(RESUME_SPOOL_FOLDER, name), name.split(".")[0])
+                   for name in os.listdir(RESUME_SPOOL_FOLDER)]
+
+    for path, sha256 in legacy:
+        if not os.path.isfile(path):
+            continue
+        cur.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,))
+        if cur.fetchone() and os.path.isfile(blob_store.blob_path(sha256)) \
+                and blob_store.file_digest(path)[0] == sha256:
+            os.remove(path)
+
+
+# ======================================
+# 12 – CASCADING DELETES
+# SQLite cannot add FOREIGN KEY ... ON DELETE CASCADE to existing
+# tables without rebuilding them (and every trigger and FTS index on
+# them), so the cascades are AFTER DELETE triggers instead. Deleting a
+# user takes their jobs, applications, resumes, notifications and
+# profile rows with it; deleting a job takes its applications, whose
+# own triggers release their resume blobs. Rows orphaned before this
+# step, and the files behind released blobs, are reclaimed by
+# services/sweeper.py, which logs each run in sweep_runs.
+# ======================================
+def _012_cascading_deletes(cur):
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id)")
+
+    # Jobs first: their applications go through the jobs cascade
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_cascade_delete
+        AFTER DELETE ON users
+        BEGIN
+            DELETE FROM jobs WHERE company_id = OLD.id;
+            DELETE FROM applications WHERE user_id = OLD.id;
+            DELETE FROM resumes WHERE user_id = OLD.id;
+            DELETE FROM notifications WHERE user_id = OLD.id;
+            DELETE FROM company_details WHERE user_id = OLD.id;
+            DELETE FROM user_preferences WHERE user_id = OLD.id;
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_cascade_delete
+        AFTER DELETE ON jobs
+        BEGIN
+            DELETE FROM applications WHERE job_id = OLD.id;
+        END
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sweep_runs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_ts  INTEGER NOT NULL,
+            duration_ms INTEGER NOT NULL,
+            report      TEXT NOT NULL
+        )
+    """)
+
+
+# ======================================
+# 13 – RESUME ORIGIN
+# Whether a resume was made with the builder ('builder') or uploaded
+# ('upload'); only built resumes can be attached to an application as
+# a rendered PDF. Rows from before this step cannot be told apart (an
+# upload that hit the parse cache has no source either) and stay NULL,
+# so they are not offered as built resumes.
+# ======================================
+def _013_resume_origin(cur):
+    _add_column(cur, "resumes", "origin", "TEXT")
+    cur.execute("UPDATE resumes SET origin = 'upload' WHERE source_sha256 IS NOT NULL")
+
+
+MIGRATIONS = [
+    _001_base_tables,
+    _002_resume_analysis,
+    _003_lookup_indexes,
+    _004_stats_counters,
+    _005_dashboard_counters,
+    _006_sortable_timestamps,
+    _007_jobs_search,
+    _008_candidate_search,
+    _009_skills,
+    _010_blob_store,
+    _011_remove_legacy_uploads,
+    _012_cascading_deletes,
+    _013_resume_origin,
+]
+
+
+# ======================================
+# RUNNER
+# ======================================
+def schema_version(cur):
+    cur.execute("PRAGMA user_version")
+    return cur.fetchone()[0]
+
+
+def migrate(database=DATABASE):
+    """Apply every pending migration; returns the resulting schema version."""
+    conn = connect(database)
+    try:
+        cur = conn.cursor()
+        while True:
+            # Lock first, then read the version, so concurrent app
+            # processes starting up never apply the same step twice
+            cur.execute("BEGIN IMMEDIATE")
+            version = schema_version(cur)
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                return version
+
+            try:
+                MIGRATIONS[version](cur)
+                cur.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            # stderr: stdout may be someone's output (benchmarks, CLI tools)
+            print(f"Database migrated to version {version + 1}", file=sys.stderr)
+    finally:
+        conn.close()
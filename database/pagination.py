@@ -0,0 +1,90 @@
+import calendar
+from datetime import datetime
+
+from flask import request, url_for
+
+from config import LIST_PAGE_SIZE, LIST_PAGE_SIZE_MAX
+
+# ══════════════════════════════════════════════════════════════════
+# KEYSET PAGINATION
+#
+# List pages never use OFFSET. Each page is ordered on an indexed key
+# (e.g. "created_ts DESC, id DESC"), and the link to the next page
+# carries the key of the last row shown as ?after=<cursor>. The next
+# query then starts with "WHERE (created_ts, id) < (?, ?)", so every
+# page costs the same however deep the user goes.
+# ══════════════════════════════════════════════════════════════════
+
+def page_size():
+    """Rows per page from ?per_page=, clamped to LIST_PAGE_SIZE_MAX."""
+    size = request.args.get("per_page", LIST_PAGE_SIZE, type=int)
+    return max(1, min(size, LIST_PAGE_SIZE_MAX))
+
+
+def encode_cursor(*values):
+    return "_".join(str(int(value)) for value in values)
+
+
+def page_cursor(parts):
+    """
+    The ?after= cursor as a tuple of `parts` ints, or None on the first
+    page. Malformed cursors are treated as the first page.
+    """
+    value = request.args.get("after", "")
+    try:
+        values = tuple(int(v) for v in value.split("_"))
+    except ValueError:
+        return None
+    return values if len(values) == parts else None
+
+
+def date_arg(name, end_of_day=False):
+    """
+    A ?name=YYYY-MM-DD filter as a unix timestamp, or None. Days are UTC
+    days, like the created_ts / applied_ts values they are compared with
+    (strftime('%s') over UTC timestamps).
+    """
+    value = request.args.get(name, "")
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None
+    ts = calendar.timegm(day.timetuple())
+    return ts + 86399 if end_of_day else ts
+
+
+class Page:
+    """
+    One page of rows. Query with LIMIT size + 1: the extra row only
+    tells whether a next page exists and is not shown.
+    """
+
+    def __init__(self, rows, size, key):
+        self.rows     = rows[:size]
+        self.has_next = len(rows) > size
+        self.cursor   = encode_cursor(*key(self.rows[-1])) if self.has_next else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    def url(self, after=None):
+        """Current URL and filters, moved to the page after `after`."""
+        args = request.args.to_dict()
+        args.pop("after", None)
+        if after:
+            args["after"] = after
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    @property
+    def next_url(self):
+        return self.url(self.cursor) if self.has_next else None
+
+    @property
+    def first_url(self):
+        return self.url() if "after" in request.args else None
@@ -0,0 +1,106 @@
+import re
+
+from markupsafe import Markup, escape
+
+# ══════════════════════════════════════════════════════════════════
+# FULL-TEXT SEARCH (SQLite FTS5)
+#
+# Search boxes never build LIKE '%x%' filters: those read every row.
+# User input is turned into an FTS5 MATCH expression instead, and
+# results are ordered by bm25(). snippet()/highlight() wrap hits in
+# the control characters below, which are swapped for <mark> tags
+# only after the surrounding text has been HTML-escaped.
+# ══════════════════════════════════════════════════════════════════
+
+HIT_START = "\x02"
+HIT_END   = "\x03"
+
+MAX_TERMS = 8
+
+# bm25() returns small negative floats (better matches are lower);
+# scaled to an integer it can go into a keyset cursor
+SCORE_SCALE = 1000000
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_query(text):
+    """
+    FTS5 MATCH expression for free text typed by a user, or None if it
+    holds no searchable words. Every word must appear (implicit AND)
+    and is matched as a prefix, so "pyth dev" finds "Python Developer".
+    Quoting each word keeps FTS5 operators (AND, NEAR, col:, ^ ...) in
+    the input from being interpreted.
+    """
+    terms = _TERM_RE.findall((text or "").lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def marked(text):
+    """snippet()/highlight() output as safe HTML with <mark> around hits."""
+    if not text:
+        return Markup("")
+    return Markup(str(escape(text))
+                  .replace(HIT_START, "<mark>")
+                  .replace(HIT_END, "</mark>"))
+
+
+_BOOLEAN_TOKEN_RE = re.compile(r'"([^"]*)"?|[()]|\w+', re.UNICODE)
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def boolean_query(text):
+    """
+    FTS5 MATCH expression supporting "quoted phrases", AND / OR / NOT
+    (upper case, as in FTS5) and parentheses, or None if the input holds
+    no searchable words:
+
+        "machine learning" AND (flask OR django) NOT intern
+
+    Bare words are prefix matches and adjacent terms are ANDed, like
+    match_query(). Stray operators and unbalanced parentheses are
+    dropped rather than reported, so any input gives a valid query.
+    """
+    out, depth, operands = [], 0, 0
+
+    def follows_operand():
+        return bool(out) and out[-1] not in _OPERATORS and out[-1] != "("
+
+    for match in _BOOLEAN_TOKEN_RE.finditer(text or ""):
+        token, phrase = match.group(0), match.group(1)
+
+        if token in _OPERATORS:
+            if follows_operand():
+                out.append(token)
+        elif token == "(":
+            if follows_operand():
+                out.append("AND")
+            out.append("(")
+            depth += 1
+        elif token == ")":
+            if not depth:
+                continue
+            while out[-1] in _OPERATORS:
+                out.pop()
+            if out[-1] == "(":
+                out.pop()
+            else:
+                out.append(")")
+            depth -= 1
+        else:
+            words = _TERM_RE.findall((phrase if phrase is not None else token).lower())
+            if not words or operands >= MAX_TERMS:
+                continue
+            if follows_operand():
+                out.append("AND")
+            out.append(f'"{" ".join(words)}"' if phrase is not None else f'"{words[0]}"*')
+            operands += 1
+
+    while out and (out[-1] in _OPERATORS or out[-1] == "("):
+        if out.pop() == "(":
+            depth -= 1
+    out.extend(")" * depth)
+
+    return " ".join(out) if operands else None
@@ -0,0 +1,65 @@
+import json
+import time
+from database.db import get_db
+from config import RESUME_CACHE_MAX_BYTES, RESUME_CACHE_MAX_ENTRIES
+from nlp.ats_scorer import ATSResult
+
+
+def get_cached(digest):
+    """
+    Parse results for previously seen upload bytes, or None.
+    Returns (content, skills, ATSResult) and marks the entry as recently used.
+    """
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        SELECT content, skills, ats_score, ats_breakdown
+        FROM resume_cache WHERE sha256 = ?
+    """, (digest,))
+    row = cur.fetchone()
+
+    if row:
+        cur.execute("UPDATE resume_cache SET last_used = ? WHERE sha256 = ?",
+                    (time.time(), digest))
+        conn.commit()
+
+    if not row:
+        return None
+    return row[0], json.loads(row[1]), ATSResult.from_json(row[2], row[3])
+
+
+def put_cached(digest, content, skills, ats):
+    """Store parse results, then evict least recently used entries over the caps."""
+    size = len(content.encode("utf-8"))
+
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        INSERT OR REPLACE INTO resume_cache
+            (sha256, content, skills, ats_score, ats_breakdown, size, last_used)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (digest, content, json.dumps(skills), ats.score, ats.to_json(), size, time.time()))
+
+    _evict(cur)
+    conn.commit()
+
+
+def _evict(cur):
+    cur.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache")
+    entries, total = cur.fetchone()
+    if entries <= RESUME_CACHE_MAX_ENTRIES and total <= RESUME_CACHE_MAX_BYTES:
+        return
+
+    # Walk from the least recently used end until both caps are met
+    cur.execute("SELECT sha256, size FROM resume_cache ORDER BY last_used")
+    evict = []
+    for digest, size in cur:
+        if entries <= RESUME_CACHE_MAX_ENTRIES and total <= RESUME_CACHE_MAX_BYTES:
+            break
+        evict.append((digest,))
+        entries -= 1
+        total   -= size
+
+    cur.executemany("DELETE FROM resume_cache WHERE sha256 = ?", evict)
@@ -0,0 +1,97 @@
+import json
+from database.db import get_db
+from nlp.ats_scorer import ATSResult
+
+
+def save_resume(user_id, content, ats, skills, origin):
+    """
+    Insert an analysed resume; returns the new resume id. origin is
+    'builder' for resumes made with the builder, 'upload' for uploads.
+    """
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        INSERT INTO resumes (user_id, content, ats_score, ats_breakdown, skills, status, origin)
+        VALUES (?, ?, ?, ?, ?, 'done', ?)
+    """, (user_id, content, ats.score, ats.to_json(), json.dumps(skills), origin))
+
+    resume_id = cur.lastrowid
+    conn.commit()
+
+    return resume_id
+
+
+def update_resume(resume_id, content, ats, skills):
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        UPDATE resumes
+        SET content = ?, ats_score = ?, ats_breakdown = ?, skills = ?
+        WHERE id = ?
+    """, (content, ats.score, ats.to_json(), json.dumps(skills), resume_id))
+
+    conn.commit()
+
+
+def queue_resume(user_id, source_path, source_sha256):
+    """
+    Insert a resume that still has to be parsed by the resume worker.
+    source_path is the upload's blob (services/blob_store.py); the row
+    holds a reference to it through source_blob.
+    """
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        INSERT INTO resumes
+          (user_id, content, ats_score, status, source_path, source_sha256, source_blob, origin)
+        VALUES (?, '', 0, 'pending', ?, ?, ?, 'upload')
+    """, (user_id, source_path, source_sha256, source_sha256))
+
+    resume_id = cur.lastrowid
+    conn.commit()
+
+    return resume_id
+
+
+def get_resume_status(resume_id, user_id):
+    """
+    Parsing status of one of user_id's resumes, or None.
+    Once status is 'done' the dict also carries skills and the ATSResult.
+    """
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        SELECT status, error, skills, ats_score, ats_breakdown FROM resumes
+        WHERE id = ? AND user_id = ?
+    """, (resume_id, user_id))
+    row = cur.fetchone()
+
+    if not row:
+        return None
+
+    status = row[0] or "done"
+    result = {"status": status, "error": row[1]}
+    if status == "done":
+        result["skills"] = json.loads(row[2]) if row[2] else []
+        result["ats"]    = ATSResult.from_json(row[3], row[4])
+    return result
+
+
+def get_ats_result(resume_id, user_id):
+    """Stored ATSResult for one of user_id's resumes, or None."""
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute("""
+        SELECT ats_score, ats_breakdown FROM resumes
+        WHERE id = ? AND user_id = ?
+    """, (resume_id, user_id))
+    row = cur.fetchone()
+
+    if not row:
+        return None
+    return ATSResult.from_json(row[0], row[1])
@@ -0,0 +1,87 @@
+from database.db import get_db
+from nlp.skill_extractor import extract_skills
+
+# ══════════════════════════════════════════════════════════════════
+# SKILL LOOKUPS
+# resume_skills and job_skills are inverted indexes keyed on
+# (skill_id, owner id), kept in step with the skills JSON columns by
+# triggers (database/migrations.py, step 9). "Which jobs share >= N of
+# my skills" and "who has python AND sql" are answered by intersecting
+# those postings lists; no resume or job text is read.
+# ══════════════════════════════════════════════════════════════════
+
+LATEST_RESUME_ID_SQL = """
+    SELECT id FROM resumes
+    WHERE user_id = ? AND status = 'done'
+    ORDER BY id DESC LIMIT 1
+"""
+
+JOBS_MATCHING_RESUME_SQL = """
+    SELECT job_skills.job_id,
+           COUNT(*) AS matched,
+           group_concat(skills.name, ', ') AS names
+    FROM resume_skills
+    JOIN job_skills ON job_skills.skill_id = resume_skills.skill_id
+    JOIN skills     ON skills.id = resume_skills.skill_id
+    WHERE resume_skills.resume_id = ?
+    GROUP BY job_skills.job_id
+    HAVING COUNT(*) >= ?
+    ORDER BY matched DESC, job_skills.job_id DESC
+    LIMIT ?
+"""
+
+
+def parse_skills(text):
+    """
+    Canonical skill names for a comma-separated filter, e.g.
+    "JS, node.js, ml" -> ["javascript", "node.js", "machine learning"].
+    Terms the taxonomy does not know are kept as typed (lower case).
+    """
+    names = []
+    for term in (text or "").split(","):
+        term = term.strip().lower()
+        if term:
+            names.extend(extract_skills(term) or [term])
+    return list(dict.fromkeys(names))
+
+
+def latest_resume_id(user_id):
+    """Id of the user's latest parsed resume, or None."""
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(LATEST_RESUME_ID_SQL, (user_id,))
+    row = cur.fetchone()
+
+    return row[0] if row else None
+
+
+def jobs_matching_resume(resume_id, min_matches, limit):
+    """
+    [(job_id, matched count, "skill, skill, ...")] for jobs sharing at
+    least min_matches skills with the resume, most shared first.
+    Walks the resume's skills, then each skill's postings in job_skills.
+    """
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(JOBS_MATCHING_RESUME_SQL, (resume_id, min_matches, limit))
+
+    return cur.fetchall()
+
+
+def resumes_with_all_skills(names):
+    """
+    (sql, params) selecting the ids of resumes that have every skill in
+    names, for use inside "resume_id IN (...)": one index range per
+    skill, intersected by counting.
+    """
+    placeholders = ",".join("?" * len(names))
+    return f"""
+        SELECT resume_skills.resume_id
+        FROM skills
+        JOIN resume_skills ON resume_skills.skill_id = skills.id
+        WHERE skills.name IN ({placeholders})
+        GROUP BY resume_skills.resume_id
+        HAVING COUNT(*) = ?
+    """, list(names) + [len(names)]
@@ -0,0 +1,79 @@
+from database.db import get_db
+
+# Queries below are module constants so database/check_query_plans.py
+# explains exactly what runs
+STAT_SQL = "SELECT value FROM stats WHERE name = ?"
+
+ALL_STATS_SQL = "SELECT name, value FROM stats"
+
+# Both counts per job are answered from idx_applications_job_status
+# alone; a join + COUNT(DISTINCT) measured about twice as slow
+COMPANY_DASHBOARD_SQL = """
+    SELECT
+        COUNT(*)          AS active_jobs,
+        IFNULL(SUM(n), 0) AS total_applicants,
+        IFNULL(SUM(s), 0) AS shortlisted
+    FROM (
+        SELECT
+            (SELECT COUNT(*) FROM applications
+             WHERE job_id = jobs.id) AS n,
+            (SELECT COUNT(*) FROM applications
+             WHERE job_id = jobs.id AND status = 'Shortlisted') AS s
+        FROM jobs
+        WHERE company_id = ?
+    )
+"""
+
+APPLICANT_DASHBOARD_SQL = """
+    SELECT
+        COUNT(*)                                            AS total_applications,
+        COUNT(CASE WHEN status = 'Shortlisted' THEN 1 END)  AS shortlisted,
+        COUNT(CASE WHEN status = 'Accepted'    THEN 1 END)  AS accepted,
+        (SELECT job_type FROM user_preferences
+         WHERE user_id = ? ORDER BY id DESC LIMIT 1)        AS preferred_job
+    FROM applications
+    WHERE user_id = ?
+"""
+
+
+def get_stat(name, default=0):
+    """Current value of a trigger-maintained counter in the stats table."""
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(STAT_SQL, (name,))
+    row = cur.fetchone()
+
+    return row[0] if row else default
+
+
+# ══════════════════════════════════════════════════════════════════
+# DASHBOARD AGGREGATES
+# One query per dashboard. Site-wide totals come straight from the
+# trigger-maintained stats rows; per-company and per-applicant figures
+# are conditional counts over the application indexes.
+# ══════════════════════════════════════════════════════════════════
+
+def admin_dashboard_stats():
+    """{counter name: value} for every stats row, e.g. 'users:company'."""
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(ALL_STATS_SQL)
+    return dict(cur.fetchall())
+
+
+def company_dashboard_stats(company_id):
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(COMPANY_DASHBOARD_SQL, (company_id,))
+    return cur.fetchone()
+
+
+def applicant_dashboard_stats(user_id):
+    conn = get_db()
+    cur  = conn.cursor()
+
+    cur.execute(APPLICANT_DASHBOARD_SQL, (user_id, user_id))
+    return cur.fetchone()
@@ -1,9 +1,15 @@
-import sqlite3
-from config import DATABASE
+from database.db import get_db
+
+# Also checked by database/check_query_plans.py
+LOGIN_SQL = """
+    SELECT id, name, email, password, role, approved
+    FROM users
+    WHERE email = ? AND password = ?
+"""
 
 
 def create_user(name, email, password, role):
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur  = conn.cursor()
 
     # Auto-approve admin, others need approval
@@ -15,21 +21,14 @@ def create_user(name, email, password, role):
     """, (name, email, password, role, approved))
 
     conn.commit()
-    conn.close()
 
 
 def get_user(email, password):
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row  # ✅ Makes user["id"] work
+    conn = get_db()
     cur  = conn.cursor()
 
-    cur.execute("""
-        SELECT id, name, email, password, role, approved
-        FROM users
-        WHERE email = ? AND password = ?
-    """, (email, password))
+    cur.execute(LOGIN_SQL, (email, password))
 
     user = cur.fetchone()
-    conn.close()
 
     return user
\ No newline at end of file
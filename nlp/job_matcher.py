@@ -1,9 +1,341 @@
+import fcntl
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from database.db import get_db
+from config import JOB_INDEX_DIR
+
+# numpy, scipy and scikit-learn are most of a worker's import time, and
+# login, dashboards and list pages never touch the index: the routes and
+# services import this module inside the functions that use it.
+
+
 def match_resume_with_jobs(resume_text, job_descriptions):
     vectorizer = TfidfVectorizer()
     vectors = vectorizer.fit_transform([resume_text] + job_descriptions)
 
     similarity_scores = cosine_similarity(vectors[0:1], vectors[1:])
     return similarity_scores[0]
+
+
+def job_document(role, description):
+    """Text that represents a job in the index."""
+    return f"{role or ''} {description or ''}".strip()
+
+
+def load_job_documents():
+    """(job_id, text) for every row of the jobs table."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, role, description FROM jobs ORDER BY id")
+        return [(row[0], job_document(row[1], row[2])) for row in cur.fetchall()]
+
+
+class JobIndex:
+    """
+    Persistent TF-IDF index over the jobs table.
+
+    Vocabulary and IDF are fitted once over the job corpus and the job
+    document-term matrix is kept on disk, so a query only has to transform
+    the resume and do one sparse mat-vec. Jobs posted later are transformed
+    with the existing vocabulary and appended; the corpus is refitted once
+    it has grown by REFIT_GROWTH since the last fit.
+
+    Every app process keeps its own copy. The whole index is one file,
+    replaced with a single rename, so a reader never pairs one version's
+    matrix with another's job ids. Updates hold an flock on LOCK_FILE and
+    start from the latest stored version, so concurrent updates from
+    several processes are applied one after the other.
+    """
+
+    REFIT_GROWTH = 0.25
+    INDEX_FILE   = "index.pkl"
+    LOCK_FILE    = "index.lock"
+    # Written by earlier versions, one file per part
+    LEGACY_FILES = ("matrix.npz", "job_ids.npy", "meta.pkl")
+
+    def __init__(self, directory=JOB_INDEX_DIR, loader=load_job_documents):
+        self.directory  = directory
+        self.loader     = loader
+        self.vectorizer = None
+        self.matrix     = sparse.csr_matrix((0, 0))
+        self.job_ids    = np.empty(0, dtype=np.int64)
+        self.fitted_size = 0
+        self.fit_id     = None
+        self._version   = None
+        self._lock      = threading.RLock()
+        self._lock_file = None
+
+    # ── persistence ───────────────────────────────────────────────
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _disk_version(self):
+        # A new file (inode) on every save; the mtime covers inode reuse
+        try:
+            stat = os.stat(self._path(self.INDEX_FILE))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def load(self):
+        """Load the index from disk; returns False if nothing is stored yet."""
+        with self._lock:
+            try:
+                with open(self._path(self.INDEX_FILE), "rb") as f:
+                    version = os.fstat(f.fileno())
+                    stored  = pickle.load(f)
+            except FileNotFoundError:
+                return False
+            self.vectorizer  = stored["vectorizer"]
+            self.fitted_size = stored["fitted_size"]
+            self.fit_id      = stored.get("fit_id")
+            self.job_ids     = stored["job_ids"]
+            self.matrix      = stored["matrix"]
+            self._version    = version.st_ino, version.st_mtime_ns
+            return True
+
+    def save(self):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump({"vectorizer":  self.vectorizer,
+                                 "fitted_size": self.fitted_size,
+                                 "fit_id":      self.fit_id,
+                                 "job_ids":     self.job_ids,
+                                 "matrix":      self.matrix},
+                                f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(self.INDEX_FILE))
+            except BaseException:
+                os.remove(tmp)
+                raise
+            self._version = self._disk_version()
+
+            for name in self.LEGACY_FILES:
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def refresh(self):
+        """Reload if another process has written a newer index."""
+        version = self._disk_version()
+        if version is not None and version != self._version:
+            self.load()
+
+    @property
+    def version(self):
+        """Changes whenever the stored index changes, including appends."""
+        return self._version
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the index for a read-modify-write, against other threads and
+        other processes, starting from the latest stored version.
+        """
+        with self._lock:
+            if self._lock_file is not None:
+                # Re-entered, e.g. add_job() -> rebuild()
+                yield
+                return
+
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(self.LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_file = lock_file
+                try:
+                    self.refresh()
+                    yield
+                finally:
+                    self._lock_file = None
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_or_build(self):
+        """Load the stored index, building it first if no process has yet."""
+        if self.load():
+            return
+        with self._writing():
+            if self.version is None:
+                self.rebuild()
+
+    # ── building / updating ───────────────────────────────────────
+    def rebuild(self, documents=None):
+        """Refit vocabulary and IDF over the whole job corpus."""
+        with self._writing():
+            if documents is None:
+                documents = self.loader()
+
+            ids   = [job_id for job_id, _ in documents]
+            texts = [text for _, text in documents]
+
+            self.vectorizer = TfidfVectorizer()
+            try:
+                self.matrix = self.vectorizer.fit_transform(texts).tocsr()
+            except ValueError:
+                # No jobs yet, or only stop words: nothing to index.
+                self.vectorizer = None
+                self.matrix     = sparse.csr_matrix((0, 0))
+                ids = []
+
+            self.job_ids     = np.asarray(ids, dtype=np.int64)
+            self.fitted_size = len(ids)
+            # New vocabulary and IDF: every score may change. add_job() and
+            # remove_jobs() keep the fit, so they leave fit_id alone.
+            self.fit_id      = uuid.uuid4().hex
+            self.save()
+
+    def add_job(self, job_id, text):
+        with self._writing():
+            grown = len(self.job_ids) + 1 - self.fitted_size
+            if self.vectorizer is None or grown > self.fitted_size * self.REFIT_GROWTH:
+                self.rebuild()
+                return
+
+            row = self.vectorizer.transform([text])
+            keep = self.job_ids != job_id
+            self.matrix  = sparse.vstack([self.matrix[keep], row], format="csr")
+            self.job_ids = np.append(self.job_ids[keep], np.int64(job_id))
+            self.save()
+
+    def remove_job(self, job_id):
+        self.remove_jobs([job_id])
+
+    def remove_jobs(self, job_ids):
+        """Drop several jobs (e.g. a deleted company's) with one save."""
+        with self._writing():
+            keep = ~np.isin(self.job_ids, np.asarray(list(job_ids), dtype=np.int64))
+            if keep.all():
+                return
+            self.matrix  = self.matrix[keep]
+            self.job_ids = self.job_ids[keep]
+            self.save()
+
+    # ── querying ──────────────────────────────────────────────────
+    def scores(self, resume_text):
+        """
+        Cosine similarity of resume_text against every indexed job.
+        Returns (job_ids, scores) as aligned numpy arrays.
+        """
+        with self._lock:
+            self.refresh()
+            if self.vectorizer is None or not self.job_ids.size:
+                return self.job_ids, np.empty(0)
+
+            # Rows are L2-normalised by TfidfVectorizer, so a dot product
+            # against the normalised resume vector is the cosine similarity.
+            vector = self.vectorizer.transform([resume_text])
+            return self.job_ids, (self.matrix @ vector.T).toarray().ravel()
+
+    def top_k(self, resume_text, k):
+        """
+        The k best matching jobs as [(job_id, score), ...], best first.
+        Uses a partial sort so only the k winners are ever ordered.
+        """
+        job_ids, scores = self.scores(resume_text)
+        if k <= 0 or not scores.size:
+            return []
+
+        if k < scores.size:
+            winners = np.argpartition(-scores, k - 1)[:k]
+        else:
+            winners = np.arange(scores.size)
+        winners = winners[np.argsort(-scores[winners], kind="stable")]
+
+        return [(int(job_ids[i]), float(scores[i])) for i in winners if scores[i] > 0]
+
+    def score_candidates(self, job_text, resume_texts):
+        """
+        Cosine similarity of every resume in resume_texts against one job,
+        computed as a single batched sparse product.
+        """
+        with self._lock:
+            self.refresh()
+            if self.vectorizer is None or not resume_texts:
+                return np.zeros(len(resume_texts))
+
+            job_vector = self.vectorizer.transform([job_text])
+            resumes    = self.vectorizer.transform(resume_texts)
+            return (resumes @ job_vector.T).toarray().ravel()
+
+
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index():
+    """Process-wide JobIndex, loaded from disk or built on first use."""
+    global _job_index
+    with _job_index_lock:
+        if _job_index is None:
+            index = JobIndex()
+            index.load_or_build()
+            _job_index = index
+    return _job_index
+
+
+# ══════════════════════════════════════════════════════════════════
+# CANDIDATE RANKING
+# ══════════════════════════════════════════════════════════════════
+
+CANDIDATE_CACHE_JOBS = 256
+
+# job_id -> (job key, {application_id: (resume digest, score)})
+_candidate_cache = OrderedDict()
+_candidate_cache_lock = threading.Lock()
+
+
+def _digest(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def rank_candidates(job_id, job_text, candidates):
+    """
+    Rank (application_id, resume_text) pairs against one job, best first.
+    Returns [(application_id, score), ...].
+
+    Scores are cached per job, keyed on a hash of the job text and the
+    index's fit, so repeat views only vectorize applications that arrived
+    (or whose resume changed) since the last call. Jobs added to or
+    removed from the index do not change a candidate's score against
+    this job; only a refit does.
+    """
+    index = get_job_index()
+    index.refresh()
+    job_key = (_digest(job_text), index.fit_id)
+
+    with _candidate_cache_lock:
+        key, cached = _candidate_cache.get(job_id, (None, {}))
+        if key != job_key:
+            cached = {}
+        _candidate_cache[job_id] = (job_key, cached)
+        _candidate_cache.move_to_end(job_id)
+        while len(_candidate_cache) > CANDIDATE_CACHE_JOBS:
+            _candidate_cache.popitem(last=False)
+
+        digests = {app_id: _digest(text) for app_id, text in candidates}
+        pending = [(app_id, text) for app_id, text in candidates
+                   if cached.get(app_id, (None,))[0] != digests[app_id]]
+
+    if pending:
+        scores = index.score_candidates(job_text, [text or "" for _, text in pending])
+        with _candidate_cache_lock:
+            for (app_id, _), score in zip(pending, scores):
+                cached[app_id] = (digests[app_id], float(score))
+
+    ranking = [(app_id, cached[app_id][1]) for app_id in digests]
+    ranking.sort(key=lambda item: item[1], reverse=True)
+    return ranking
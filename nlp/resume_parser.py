@@ -1,8 +1,195 @@
-import pdfplumber
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import PDF_BACKEND, PDF_PAGE_WORKERS, PDF_PARALLEL_MIN_PAGES, POOL_START_METHOD
+from nlp.ats_scorer import score_resume
+from nlp.skill_extractor import extract_skills
+
+# ══════════════════════════════════════════════════════════════════
+# PDF BACKENDS
+# Each backend takes a path or binary file object plus an optional
+# (start, stop) page range and returns a list with one string per page.
+# Libraries are imported on first use so only the chosen one is loaded.
+# ══════════════════════════════════════════════════════════════════
+
+def _pages_pypdfium2(source, page_range=None):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        start, stop = page_range or (0, len(pdf))
+        pages = []
+        for i in range(start, stop):
+            page     = pdf[i]
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return pages
+    finally:
+        pdf.close()
+
+
+def _pages_pypdf2(source, page_range=None):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(source)
+    start, stop = page_range or (0, len(reader.pages))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _pages_pdfplumber(source, page_range=None):
+    import pdfplumber
+
+    with pdfplumber.open(source) as pdf:
+        start, stop = page_range or (0, len(pdf.pages))
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+PDF_BACKENDS = {
+    'pypdfium2':  _pages_pypdfium2,
+    'pypdf2':     _pages_pypdf2,
+    'pdfplumber': _pages_pdfplumber,
+}
+
+
+def _page_count(path):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _extract_range(backend, path, page_range):
+    return PDF_BACKENDS[backend](path, page_range)
+
+
+# One page pool per process, created for the first long document and
+# reused after that. This runs inside the resume worker's processes, so
+# a pool per document would start and stop processes for every upload.
+_page_pool      = None
+_page_pool_size = 0
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool(workers):
+    global _page_pool, _page_pool_size
+    with _page_pool_lock:
+        if _page_pool is None or _page_pool_size < workers:
+            if _page_pool is not None:
+                _page_pool.shutdown(wait=False)
+            _page_pool      = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+            _page_pool_size = workers
+        return _page_pool
+
+
+def _reset_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        _page_pool = None
+
+
+def extract_pdf_pages(source, backend=PDF_BACKEND, workers=PDF_PAGE_WORKERS):
+    """
+    Text of every page of a PDF, as a list of strings.
+
+    source is a path or a binary file object. For paths to documents with
+    at least PDF_PARALLEL_MIN_PAGES pages, the pages are split into one
+    contiguous range per worker (capped at the CPU count) and extracted
+    across this process's page pool.
+    """
+    extract = PDF_BACKENDS[backend]
+    workers = min(workers, os.cpu_count() or 1)
+
+    if workers <= 1 or not isinstance(source, (str, os.PathLike)):
+        return extract(source)
+
+    total = _page_count(source)
+    if total < PDF_PARALLEL_MIN_PAGES:
+        return extract(source)
+
+    step   = -(-total // workers)
+    ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+
+    pool = _get_page_pool(workers)
+    try:
+        chunks = pool.map(_extract_range, [backend] * len(ranges),
+                          [source] * len(ranges), ranges)
+        return [page for chunk in chunks for page in chunk]
+    except BrokenProcessPool:
+        # A page worker died; start a fresh pool for the next document
+        _reset_page_pool()
+        raise
+
+
+def extract_pdf_text(source, backend=PDF_BACKEND, workers=PDF_PAGE_WORKERS):
+    return "\n".join(extract_pdf_pages(source, backend, workers)).strip()
+
+
+# ══════════════════════════════════════════════════════════════════
+# FILE EXTRACTORS
+# ══════════════════════════════════════════════════════════════════
 
 def extract_resume_text(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text()
-    return text
+    return extract_pdf_text(pdf_path)
+
+
+def extract_text_from_pdf(file):
+    try:
+        return extract_pdf_text(file)
+    except Exception as e:
+        print(f"Error extracting PDF: {e}")
+        return ""
+
+
+def extract_text_from_docx(file):
+    import docx
+
+    try:
+        doc  = docx.Document(file)
+        text = "\n".join([p.text for p in doc.paragraphs])
+        return text.strip()
+    except Exception as e:
+        print(f"Error extracting DOCX: {e}")
+        return ""
+
+
+def extract_text_from_txt(file):
+    try:
+        return file.read().decode('utf-8').strip()
+    except Exception as e:
+        print(f"Error extracting TXT: {e}")
+        return ""
+
+
+EXTRACTORS = {
+    'pdf':  extract_text_from_pdf,
+    'docx': extract_text_from_docx,
+    'txt':  extract_text_from_txt,
+}
+
+
+def parse_resume_file(path, file_ext):
+    """
+    Full analysis of a stored upload: (content, skills, ATSResult).
+    Runs inside the resume worker pool, so it must stay picklable and
+    free of Flask state. content is "" when no text could be extracted.
+    """
+    if file_ext == 'pdf':
+        # Pass the path so long documents can be split across processes
+        content = extract_text_from_pdf(path)
+    else:
+        with open(path, "rb") as f:
+            content = EXTRACTORS[file_ext](f)
+
+    if not content or len(content.strip()) < 10:
+        return "", [], None
+
+    return content, extract_skills(content), score_resume(content)
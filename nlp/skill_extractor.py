@@ -1,19 +1,117 @@
-import nltk
-from nltk.tokenize import word_tokenize
+import re
+import threading
 
-def extract_skills(text):
-    # fallback stopwords (manual)
-    stop_words = {
-        "and","or","the","is","to","in","of","for","with","a","an","on"
-    }
+from config import SKILL_TAXONOMY
+
+# ══════════════════════════════════════════════════════════════════
+# SKILL MATCHER
+# The taxonomy (nlp/data/skills.txt) is compiled once into a trie of
+# words. Extraction lower-cases the text, splits it into words with one
+# regex and walks the trie from each word, keeping the longest skill
+# that ends there (FlashText-style), so "machine learning" and
+# "node.js" are found in the same single pass as "python".
+# ══════════════════════════════════════════════════════════════════
+
+# Words are runs of letters/digits plus "+" and "#" (c++, c#), with a
+# leading "." kept when it starts a word (.net); any other character,
+# including "." inside a word (node.js) and "-" or "/", separates words
+_WORD_RE = re.compile(r"(?:(?<![\w+#])\.)?[\w+#]+")
+
+_END = None   # trie key holding the canonical name of a finished phrase
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """Longest-match dictionary matcher over a word trie."""
+
+    def __init__(self):
+        self._trie   = {}
+        self.phrases = 0
+
+    def add(self, phrase, canonical):
+        words = _words(phrase)
+        if not words:
+            raise ValueError(f"Skill phrase without words: {phrase!r}")
+
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+
+        existing = node.get(_END)
+        if existing is not None and existing != canonical:
+            raise ValueError(f"{phrase!r} maps to both {existing!r} and {canonical!r}")
+        if existing is None:
+            self.phrases += 1
+        node[_END] = canonical
 
-    words = word_tokenize(text.lower())
+    def extract(self, text):
+        """Canonical skills found in text, each once, in order of first mention."""
+        words = _words(text or "")
+        trie  = self._trie
+        found = {}
 
-    skill_set = [
-        "python", "java", "sql", "flask", "django",
-        "html", "css", "javascript",
-        "machine learning", "ai"
-    ]
+        i, n = 0, len(words)
+        while i < n:
+            node = trie.get(words[i])
+            if node is None:
+                i += 1
+                continue
 
-    skills = [w for w in words if w in skill_set and w not in stop_words]
-    return list(set(skills))
+            match, end = node.get(_END), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, end = node[_END], j
+
+            if match is None:
+                i += 1
+            else:
+                found.setdefault(match)
+                i = end
+
+        return list(found)
+
+
+def load_taxonomy(path=SKILL_TAXONOMY):
+    """
+    SkillMatcher for a taxonomy file: one "canonical | alias | ..." line
+    per skill, "#" comments and blank lines ignored.
+    """
+    matcher = SkillMatcher()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line.lstrip().startswith("#"):
+                continue
+            names = [name.strip().lower() for name in line.split("|") if name.strip()]
+            if not names:
+                continue
+            try:
+                for name in names:
+                    matcher.add(name, names[0])
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: {e}") from None
+    return matcher
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """Process-wide SkillMatcher for SKILL_TAXONOMY, compiled on first use."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = load_taxonomy()
+    return _matcher
+
+
+def extract_skills(text):
+    return get_matcher().extract(text)
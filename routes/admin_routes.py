@@ -1,9 +1,31 @@
-from flask import Blueprint, render_template, redirect, url_for, session
-import sqlite3
-from config import DATABASE
+from flask import Blueprint, render_template, redirect, request, url_for, session
+from database.db import get_db
+from database.pagination import Page, date_arg, page_cursor, page_size
+from models.stats_model import admin_dashboard_stats, get_stat
+from services import sweeper
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
+# Fixed queries and the page builders below are also explained by
+# database/check_query_plans.py
+COMPANY_JOB_IDS_SQL = "SELECT id FROM jobs WHERE company_id = ?"
+
+COMPANIES_SQL = """
+    SELECT users.id, users.name, users.email, users.approved,
+           company_details.verified
+    FROM users
+    LEFT JOIN company_details
+    ON users.id = company_details.user_id
+    WHERE users.role = 'company'
+    ORDER BY users.id DESC
+"""
+
+VERIFY_COMPANY_SQL = """
+    UPDATE company_details
+    SET verified = 1
+    WHERE user_id = ?
+"""
+
 
 # ==============================
 # ADMIN PROTECTION HELPER
@@ -14,6 +36,38 @@ def admin_required():
     return True
 
 
+def forget_jobs(job_ids):
+    """Drop deleted jobs from the matching index."""
+    if not job_ids:
+        return
+    try:
+        from nlp.job_matcher import get_job_index
+        get_job_index().remove_jobs(job_ids)
+    except Exception as e:
+        print(f"Job index error: {e}")
+
+
+def company_job_ids(cur, user_id):
+    """Jobs the cascade will delete along with this user."""
+    cur.execute(COMPANY_JOB_IDS_SQL, (user_id,))
+    return [row[0] for row in cur.fetchall()]
+
+
+# ==============================
+# SIDEBAR BADGE
+# Only admin pages show it, so other pages never query for it
+# ==============================
+@admin_bp.context_processor
+def inject_pending_count():
+    pending_count = 0
+    try:
+        pending_count = get_stat("pending_users")
+    except Exception:
+        pending_count = 0
+
+    return dict(pending_count=pending_count)
+
+
 # ==============================
 # Admin Dashboard
 # ==============================
@@ -23,35 +77,19 @@ def dashboard():
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        cur = conn.cursor()
-
-        cur.execute("SELECT COUNT(*) FROM users")
-        total_users = cur.fetchone()[0]
+    stats = admin_dashboard_stats()
 
-        cur.execute("SELECT COUNT(*) FROM users WHERE approved = 0")
-        pending_users = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM jobs")
-        active_jobs = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE role = 'company'")
-        total_companies = cur.fetchone()[0]
-
-        cur.execute("SELECT role, COUNT(*) FROM users GROUP BY role")
-        role_data = cur.fetchall()
-
-    role_counts = {"admin": 0, "company": 0, "applicant": 0}
-
-    for r in role_data:
-        role_counts[r[0]] = r[1]
+    role_counts = {
+        role: stats.get(f"users:{role}", 0)
+        for role in ("admin", "company", "applicant")
+    }
 
     return render_template(
         "admin/dashboard.html",
-        total_users=total_users,
-        pending_users=pending_users,
-        active_jobs=active_jobs,
-        total_companies=total_companies,
+        total_users=stats.get("users", 0),
+        pending_users=stats.get("pending_users", 0),
+        active_jobs=stats.get("jobs", 0),
+        total_companies=role_counts["company"],
         role_counts=role_counts
     )
 
@@ -59,23 +97,40 @@ def dashboard():
 # ==============================
 # Pending Users
 # ==============================
+def pending_users_query(role, after, size):
+    """(sql, params) for one page of /admin/pending-users."""
+    where, params = ["approved = 0"], []
+    if role:
+        where.append("role = ?")
+        params.append(role)
+    if after:
+        where.append("id < ?")
+        params.extend(after)
+
+    return f"""
+        SELECT id, name, email, role
+        FROM users
+        WHERE {" AND ".join(where)}
+        ORDER BY id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
 @admin_bp.route("/pending-users")
 def pending_users():
 
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    size  = page_size()
+    after = page_cursor(1)
+    role  = request.args.get("role", "")
+
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT id, name, email, role
-            FROM users
-            WHERE approved = 0
-            ORDER BY id DESC
-        """)
-        users = cur.fetchall()
+        cur.execute(*pending_users_query(role, after, size))
+        users = Page(cur.fetchall(), size, key=lambda row: (row["id"],))
 
     return render_template("admin/users.html", users=users)
 
@@ -89,7 +144,7 @@ def approve_user(uid):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
         cur.execute("UPDATE users SET approved = 1 WHERE id = ?", (uid,))
         conn.commit()
@@ -106,19 +161,10 @@ def companies():
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT users.id, users.name, users.email, users.approved,
-                   company_details.verified
-            FROM users
-            LEFT JOIN company_details
-            ON users.id = company_details.user_id
-            WHERE users.role = 'company'
-            ORDER BY users.id DESC
-        """)
+        cur.execute(COMPANIES_SQL)
         companies = cur.fetchall()
 
     return render_template("admin/companies_manage.html", companies=companies)
@@ -133,14 +179,10 @@ def verify_company(user_id):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            UPDATE company_details
-            SET verified = 1
-            WHERE user_id = ?
-        """, (user_id,))
+        cur.execute(VERIFY_COMPANY_SQL, (user_id,))
 
         conn.commit()
 
@@ -156,38 +198,62 @@ def delete_company(company_id):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
 
+        job_ids = company_job_ids(cur, company_id)
+
+        # Profile, jobs and their applications go too (cascade triggers)
         cur.execute("DELETE FROM users WHERE id = ?", (company_id,))
-        cur.execute("DELETE FROM company_details WHERE user_id = ?", (company_id,))
         conn.commit()
 
+    forget_jobs(job_ids)
+
     return redirect(url_for("admin.companies"))
 
 
 # ==============================
 # Manage Applicants
 # ==============================
+def users_query(role, status, after, size):
+    """(sql, params) for one page of /admin/users."""
+    where, params = ["role = ?"], [role]
+    if status == "approved":
+        where.append("approved = 1")
+    elif status == "pending":
+        where.append("approved = 0")
+    if after:
+        where.append("id < ?")
+        params.extend(after)
+
+    return f"""
+        SELECT id, name, email, role, approved
+        FROM users
+        WHERE {" AND ".join(where)}
+        ORDER BY id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
 @admin_bp.route("/users")
 def manage_users():
 
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    size   = page_size()
+    after  = page_cursor(1)
+    role   = request.args.get("role", "applicant")
+    status = request.args.get("status", "")
+
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT id, name, email, role, approved
-            FROM users
-            WHERE role = 'applicant'
-            ORDER BY id DESC
-        """)
-        users = cur.fetchall()
+        cur.execute(*users_query(role, status, after, size))
+        users = Page(cur.fetchall(), size, key=lambda row: (row["id"],))
 
-    return render_template("admin/manage_users.html", users=users)
+    return render_template("admin/manage_users.html", users=users, role=role,
+                           total_users=get_stat(f"users:{role}"))
 
 
 # ==============================
@@ -199,7 +265,7 @@ def update_user_status(user_id):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
 
         cur.execute("SELECT approved FROM users WHERE id = ?", (user_id,))
@@ -222,38 +288,68 @@ def delete_user(user_id):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
+        job_ids = company_job_ids(cur, user_id)
+
+        # Applications, resumes, notifications etc. go too (cascade triggers)
         cur.execute("DELETE FROM users WHERE id = ?", (user_id,))
         conn.commit()
 
+    forget_jobs(job_ids)
+
     return redirect("/admin/users")
 
 
 # ==============================
 # View Jobs
 # ==============================
+def jobs_query(types, since, until, after, size):
+    """(sql, params) for one page of /admin/jobs."""
+    where, params = [], []
+    if types:
+        where.append("type = ?")
+        params.append(types)
+    if since is not None:
+        where.append("created_ts >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("created_ts <= ?")
+        params.append(until)
+    if after:
+        where.append("(created_ts, id) < (?, ?)")
+        params.extend(after)
+
+    return f"""
+        SELECT id, role, company_name, company_id,
+               vacancy, type, salary, experience,
+               description, created_at, created_ts
+        FROM jobs
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY created_ts DESC, id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
 @admin_bp.route("/jobs")
 def jobs():
 
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    size   = page_size()
+    after  = page_cursor(2)
+    types  = request.args.get("type", "")
+    since  = date_arg("from")
+    until  = date_arg("to", end_of_day=True)
+
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT id, role, company_name, company_id,
-                   vacancy, type, salary, experience,
-                   description, created_at
-            FROM jobs
-            ORDER BY datetime(created_at) DESC
-        """)
-        jobs = cur.fetchall()
+        cur.execute(*jobs_query(types, since, until, after, size))
+        jobs = Page(cur.fetchall(), size, key=lambda row: (row["created_ts"], row["id"]))
 
-        cur.execute("SELECT COUNT(*) FROM jobs")
-        total_jobs = cur.fetchone()[0]
+    total_jobs = get_stat("jobs")
 
     return render_template("admin/jobs.html", jobs=jobs, total_jobs=total_jobs)
 
@@ -267,32 +363,96 @@ def delete_job(job_id):
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cur = conn.cursor()
+
+        # Its applications go too (cascade trigger)
         cur.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
         conn.commit()
 
+    forget_jobs([job_id])
+
     return redirect("/admin/jobs")
 
 
 # ==============================
 # View Applications
 # ==============================
+def applications_query(status, job_id, since, until, after, size):
+    """(sql, params) for one page of /admin/applications."""
+    where, params = [], []
+    if status:
+        where.append("applications.status = ?")
+        params.append(status)
+    if job_id:
+        where.append("applications.job_id = ?")
+        params.append(job_id)
+    if since is not None:
+        where.append("applications.applied_ts >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("applications.applied_ts <= ?")
+        params.append(until)
+    if after:
+        where.append("applications.id < ?")
+        params.extend(after)
+
+    # ids grow with insertion, so newest first is id order
+    return f"""
+        SELECT applications.id, applications.full_name, applications.user_id,
+               applications.job_id, jobs.role, applications.status,
+               applications.applied_ts
+        FROM applications
+        LEFT JOIN jobs ON jobs.id = applications.job_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY applications.id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
 @admin_bp.route("/applications")
 def applications():
 
     if not admin_required():
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    size   = page_size()
+    after  = page_cursor(1)
+    status = request.args.get("status", "")
+    job_id = request.args.get("job_id", type=int)
+    since  = date_arg("from")
+    until  = date_arg("to", end_of_day=True)
+
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT id, user_id, job_id, status, applied_at
-            FROM applications
-            ORDER BY datetime(applied_at) DESC
-        """)
-        applications = cur.fetchall()
+        cur.execute(*applications_query(status, job_id, since, until, after, size))
+        applications = Page(cur.fetchall(), size, key=lambda row: (row["id"],))
+
+    return render_template("admin/applications.html", applications=applications)
+
+
+# ==============================
+# Maintenance (orphan sweeper)
+# ==============================
+@admin_bp.route("/maintenance")
+def maintenance():
+
+    if not admin_required():
+        return redirect("/login")
+
+    runs = sweeper.recent_runs(get_db())
+
+    return render_template("admin/maintenance.html", runs=runs)
+
+
+@admin_bp.route("/maintenance/sweep", methods=["POST"])
+def run_sweep():
+
+    if not admin_required():
+        return redirect("/login")
+
+    # Runs in the background; the page lists it once it has started
+    sweeper.request_sweep()
 
-    return render_template("admin/applications.html", applications=applications)
\ No newline at end of file
+    return redirect(url_for("admin.maintenance"))
@@ -1,16 +1,20 @@
-from flask import Blueprint, render_template, request, redirect, send_file, session, flash
+from flask import Blueprint, render_template, request, redirect, session, flash, jsonify
 
-import sqlite3
-from config import DATABASE
+from database.db import get_db
+from database.pagination import Page, page_cursor, page_size
+from database.search import HIT_END, HIT_START, SCORE_SCALE, marked, match_query
+from config import RECOMMENDED_JOBS_LIMIT, RECOMMENDED_JOBS_MAX, SKILL_MATCH_MIN
 from nlp.skill_extractor import extract_skills
-from nlp.ats_scorer import calculate_ats_score
+from nlp.ats_scorer import score_resume, CATEGORY_MAX
+from models.resume_model import (save_resume, update_resume, queue_resume,
+                                 get_resume_status, get_ats_result)
+from services import blob_store, resume_docx, resume_pdf, resume_worker
+from models.resume_cache import get_cached
+from models.stats_model import applicant_dashboard_stats
+from models.skill_model import jobs_matching_resume, latest_resume_id
+from services.uploads import store_upload, UploadError
+from services.downloads import send_private_file
 from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import io
 import os
 from datetime import datetime
 
@@ -18,9 +22,24 @@ applicant_bp = Blueprint("applicant", __name__)
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
-# Absolute path — fixes FileNotFoundError on Windows
-BASE_DIR      = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_FOLDER = os.path.join(BASE_DIR, '..', 'uploads')
+# Fixed queries and the page builders below are also explained by
+# database/check_query_plans.py
+CLEAR_PREFERENCE_SQL = "DELETE FROM user_preferences WHERE user_id = ?"
+
+LATEST_RESUME_SQL = """
+    SELECT content FROM resumes
+    WHERE user_id = ? AND status = 'done'
+    ORDER BY id DESC LIMIT 1
+"""
+
+ALREADY_APPLIED_SQL = "SELECT id FROM applications WHERE user_id=? AND job_id=?"
+
+# Resumes made with the builder, not uploads (see migration 13)
+BUILT_RESUMES_SQL = """
+    SELECT id, substr(content, 1, 80) FROM resumes
+    WHERE user_id = ? AND origin = 'builder' AND status = 'done'
+    ORDER BY id DESC LIMIT 10
+"""
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -30,33 +49,6 @@ UPLOAD_FOLDER = os.path.join(BASE_DIR, '..', 'uploads')
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file):
-    try:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    except Exception as e:
-        print(f"Error extracting PDF: {e}")
-        return ""
-
-def extract_text_from_docx(file):
-    try:
-        doc  = docx.Document(file)
-        text = "\n".join([p.text for p in doc.paragraphs])
-        return text.strip()
-    except Exception as e:
-        print(f"Error extracting DOCX: {e}")
-        return ""
-
-def extract_text_from_txt(file):
-    try:
-        return file.read().decode('utf-8').strip()
-    except Exception as e:
-        print(f"Error extracting TXT: {e}")
-        return ""
-
 
 # ══════════════════════════════════════════════════════════════════
 # ROUTES
@@ -71,58 +63,23 @@ def dashboard():
 
     user_id = session.get("user_id")
 
-    total_applications = 0
-    shortlisted = 0
-    accepted = 0
-    user = None
-    preferred_job = None   # 👈 NEW
-
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
+    conn = get_db()
     cur = conn.cursor()
 
     # 🔹 Get User Details
     cur.execute("SELECT * FROM users WHERE id = ?", (user_id,))
     user = cur.fetchone()
 
-    # 🔹 Get Preferred Job
-    cur.execute("""
-        SELECT job_type 
-        FROM user_preferences 
-        WHERE user_id = ?
-    """, (user_id,))
-    pref = cur.fetchone()
-
-    if pref:
-        preferred_job = pref["job_type"]
-
-    # 🔹 Total Applications
-    cur.execute("SELECT COUNT(*) FROM applications WHERE user_id = ?", (user_id,))
-    total_applications = cur.fetchone()[0]
-
-    # 🔹 Shortlisted
-    cur.execute("""
-        SELECT COUNT(*) FROM applications 
-        WHERE user_id = ? AND status = 'Shortlisted'
-    """, (user_id,))
-    shortlisted = cur.fetchone()[0]
-
-    # 🔹 Accepted
-    cur.execute("""
-        SELECT COUNT(*) FROM applications 
-        WHERE user_id = ? AND status = 'Accepted'
-    """, (user_id,))
-    accepted = cur.fetchone()[0]
-
-    conn.close()
+    # 🔹 Application counts + preferred job in one aggregate
+    stats = applicant_dashboard_stats(user_id)
 
     return render_template(
         "applicant/dashboard.html",
         user=user,
-        total_applications=total_applications,
-        shortlisted=shortlisted,
-        accepted=accepted,
-        preferred_job=preferred_job   # 👈 PASS TO TEMPLATE
+        total_applications=stats["total_applications"],
+        shortlisted=stats["shortlisted"],
+        accepted=stats["accepted"],
+        preferred_job=stats["preferred_job"]   # 👈 PASS TO TEMPLATE
     )
 
 @applicant_bp.route("/update-profile", methods=["POST"])
@@ -135,7 +92,7 @@ def update_profile():
     name = request.form["name"]
     email = request.form["email"]
 
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur = conn.cursor()
 
     cur.execute("""
@@ -145,7 +102,6 @@ def update_profile():
     """, (name, email, user_id))
 
     conn.commit()
-    conn.close()
 
     # 🔥 Update session after DB update
     session["user_name"] = name
@@ -161,7 +117,7 @@ def update_password():
     new_password = request.form["new_password"]
     hashed_password = generate_password_hash(new_password)
 
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur = conn.cursor()
 
     cur.execute("""
@@ -171,7 +127,6 @@ def update_password():
     """, (hashed_password, session["user_id"]))
 
     conn.commit()
-    conn.close()
 
     return redirect("/applicant/profile.html")
 # profile 
@@ -181,26 +136,24 @@ def profile():
     if "user_id" not in session:
         return redirect("/login")
 
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
+    conn = get_db()
     cur = conn.cursor()
 
     cur.execute("SELECT * FROM users WHERE id = ?", (session["user_id"],))
     user = cur.fetchone()
 
-    conn.close()
-
     return render_template("applicant/profile.html", user=user)
 # ── Upload Resume ──────────────────────────────────────────────────
 @applicant_bp.route("/upload-resume", methods=["GET", "POST"])
 def upload_resume():
-    message   = ""
-    skills    = []
-    ats_score = None
+    message    = ""
+    skills     = []
+    ats_score  = None
+    ats        = None
+    pending_id = None
 
     if request.method == "POST":
         user_id = request.form.get("user_id")
-        content = ""
 
         if 'resume' not in request.files:
             message = "⚠️ No file uploaded"
@@ -214,46 +167,78 @@ def upload_resume():
             return render_template("applicant/upload_resume.html",
                                    message=message, skills=skills, ats_score=ats_score)
 
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_ext = filename.rsplit('.', 1)[1].lower()
-            file.stream.seek(0)
-
-            if file_ext == 'pdf':
-                content = extract_text_from_pdf(file)
-            elif file_ext == 'docx':
-                content = extract_text_from_docx(file)
-            elif file_ext == 'txt':
-                content = extract_text_from_txt(file)
-
-            if not content or len(content.strip()) < 10:
-                message = "⚠️ Could not extract text. Please try another format."
-                return render_template("applicant/upload_resume.html",
-                                       message=message, skills=skills, ats_score=ats_score)
-        else:
+        if not (file and allowed_file(file.filename)):
             message = "⚠️ Invalid format. Upload PDF, DOCX, or TXT."
             return render_template("applicant/upload_resume.html",
                                    message=message, skills=skills, ats_score=ats_score)
 
-        skills    = extract_skills(content)
-        ats_score = calculate_ats_score(content)
+        filename = secure_filename(file.filename)
+        file_ext = filename.rsplit('.', 1)[1].lower()
 
         try:
-            conn = sqlite3.connect(DATABASE)
-            cur  = conn.cursor()
-            cur.execute(
-                "INSERT INTO resumes (user_id, content, ats_score) VALUES (?, ?, ?)",
-                (user_id, content, ats_score)
-            )
-            conn.commit()
-            conn.close()
-            message = "✅ Resume uploaded successfully!"
+            # Stream to disk in chunks while hashing; never held in memory
+            temp_path, digest, size = store_upload(file, blob_store.temp_dir(), file_ext)
+        except UploadError as e:
+            return render_template("applicant/upload_resume.html",
+                                   message=str(e), skills=skills, ats_score=ats_score)
+
+        try:
+            # Same bytes uploaded before → reuse text, skills and score
+            cached = get_cached(digest)
+
+            if cached:
+                os.remove(temp_path)
+                content, skills, ats = cached
+                ats_score = ats.score
+                save_resume(user_id, content, ats, skills, origin="upload")
+                message = "✅ Resume uploaded successfully!"
+            else:
+                # Store and acknowledge now; the resume worker parses it
+                source_path = blob_store.put_temp(get_db().cursor(), temp_path, digest, size)
+
+                pending_id = queue_resume(user_id, source_path, digest)
+                remember_pending(pending_id, user_id)
+                resume_worker.notify()
+                message = "⏳ Resume uploaded – analysing it now…"
         except Exception as e:
             message = f"⚠️ Database error: {str(e)}"
             print(f"Database error: {e}")
 
     return render_template("applicant/upload_resume.html",
-                           message=message, skills=skills, ats_score=ats_score)
+                           message=message, skills=skills, ats_score=ats_score,
+                           ats=ats, category_max=CATEGORY_MAX, pending_id=pending_id)
+
+
+# ── Resume Parsing Status ──────────────────────────────────────────
+PENDING_REMEMBERED = 10
+
+
+def remember_pending(resume_id, user_id):
+    """Let this browser poll the status of a resume it just uploaded."""
+    pending = session.get("pending_resumes", {})
+    pending[str(resume_id)] = user_id
+    # Only the latest few; the session lives in a cookie
+    session["pending_resumes"] = dict(list(pending.items())[-PENDING_REMEMBERED:])
+
+
+@applicant_bp.route("/resume/<int:resume_id>/status")
+def resume_status(resume_id):
+    """Polled by the upload page until the resume worker is done."""
+    # 🔐 Only the uploader's session, or the owner, may see the result
+    user_id = session.get("pending_resumes", {}).get(str(resume_id)) or session.get("user_id")
+    if not user_id:
+        return jsonify({"error": "Resume not found"}), 404
+
+    result = get_resume_status(resume_id, user_id)
+
+    if result is None:
+        return jsonify({"error": "Resume not found"}), 404
+
+    ats = result.pop("ats", None)
+    if ats:
+        result.update(score=ats.score, breakdown=ats.breakdown,
+                      max=CATEGORY_MAX, feedback=ats.feedback)
+    return jsonify(result)
 
 
 # ── Job Preferences ───────────────────────────────────────────────
@@ -273,11 +258,11 @@ def save_preference():
     user_id = session["user_id"]
     job_type = request.form["job_type"]
 
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur = conn.cursor()
 
     # Delete old preference
-    cur.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
+    cur.execute(CLEAR_PREFERENCE_SQL, (user_id,))
 
     # Insert new preference (location_type = NULL)
     cur.execute("""
@@ -286,7 +271,6 @@ def save_preference():
     """, (user_id, job_type))
 
     conn.commit()
-    conn.close()
 
     return redirect("/applicant/jobs")
 # ── Build Resume ───────────────────────────────────────────────────
@@ -296,24 +280,17 @@ def build_resume():
         user_id     = request.form.get("user_id")
         resume_data = collect_resume_data(request.form)
         content     = generate_professional_resume(resume_data)
-        ats_score   = calculate_ats_score(content)
+        ats         = score_resume(content)
         skills      = extract_skills(content)
 
         try:
-            conn = sqlite3.connect(DATABASE)
-            cur  = conn.cursor()
-            cur.execute(
-                "INSERT INTO resumes (user_id, content, ats_score) VALUES (?, ?, ?)",
-                (user_id, content, ats_score)
-            )
-            resume_id = cur.lastrowid
-            conn.commit()
-            conn.close()
+            resume_id = save_resume(user_id, content, ats, skills, origin="builder")
 
             return render_template(
                 "applicant/resume_preview.html",
                 resume_id=resume_id, user_id=user_id,
-                content=content, ats_score=ats_score,
+                content=content, ats_score=ats.score,
+                ats=ats, category_max=CATEGORY_MAX,
                 skills=skills, resume_data=resume_data,
                 message="✅ Resume created successfully!"
             )
@@ -332,23 +309,18 @@ def edit_resume(resume_id):
         user_id     = request.form.get("user_id")
         resume_data = collect_resume_data(request.form)
         content     = generate_professional_resume(resume_data)
-        ats_score   = calculate_ats_score(content)
+        ats         = score_resume(content)
         skills      = extract_skills(content)
 
         try:
-            conn = sqlite3.connect(DATABASE)
-            cur  = conn.cursor()
-            cur.execute(
-                "UPDATE resumes SET content = ?, ats_score = ? WHERE id = ?",
-                (content, ats_score, resume_id)
-            )
-            conn.commit()
-            conn.close()
+            update_resume(resume_id, content, ats, skills)
+            resume_docx.invalidate(resume_id)
 
             return render_template(
                 "applicant/resume_preview.html",
                 resume_id=resume_id, user_id=user_id,
-                content=content, ats_score=ats_score,
+                content=content, ats_score=ats.score,
+                ats=ats, category_max=CATEGORY_MAX,
                 skills=skills, resume_data=resume_data,
                 message="✅ Resume updated successfully!"
             )
@@ -358,11 +330,10 @@ def edit_resume(resume_id):
                                    error=f"⚠️ Error updating resume: {str(e)}")
 
     try:
-        conn = sqlite3.connect(DATABASE)
+        conn = get_db()
         cur  = conn.cursor()
         cur.execute("SELECT content, user_id FROM resumes WHERE id = ?", (resume_id,))
         result = cur.fetchone()
-        conn.close()
         if result:
             return render_template("applicant/build_resume.html")
         return redirect("/applicant/dashboard")
@@ -371,30 +342,49 @@ def edit_resume(resume_id):
         return redirect("/applicant/dashboard")
 
 
+# ── ATS Breakdown ──────────────────────────────────────────────────
+@applicant_bp.route("/resume/<int:resume_id>/ats")
+def resume_ats(resume_id):
+    """Stored score breakdown; never re-runs the scorer."""
+    if "user_id" not in session:
+        return redirect("/login")
+
+    ats = get_ats_result(resume_id, session["user_id"])
+    if ats is None:
+        return jsonify({"error": "Resume not found"}), 404
+
+    return jsonify({
+        "score":     ats.score,
+        "breakdown": ats.breakdown,
+        "max":       CATEGORY_MAX,
+        "feedback":  ats.feedback
+    })
+
+
 # ── Download Resume ────────────────────────────────────────────────
 @applicant_bp.route("/download-resume/<int:resume_id>")
 def download_resume(resume_id):
+    if "user_id" not in session:
+        return redirect("/login")
+
     try:
-        conn = sqlite3.connect(DATABASE)
+        conn = get_db()
         cur  = conn.cursor()
-        cur.execute("SELECT content, user_id FROM resumes WHERE id = ?", (resume_id,))
+        cur.execute("SELECT content, user_id FROM resumes WHERE id = ? AND user_id = ?",
+                    (resume_id, session["user_id"]))
         result = cur.fetchone()
-        conn.close()
 
         if not result:
             return "Resume not found", 404
 
         content, user_id = result
-        doc         = create_professional_docx(content)
-        file_stream = io.BytesIO()
-        doc.save(file_stream)
-        file_stream.seek(0)
+        # 📄 Rendered once per resume text
+        path, digest = resume_docx.cached_docx(resume_id, content)
 
         filename = f"Resume_{user_id}_{datetime.now().strftime('%Y%m%d')}.docx"
-        return send_file(
-            file_stream,
-            as_attachment=True,
-            download_name=filename,
+        # Unchanged resumes answer 304
+        return send_private_file(
+            path, filename, as_attachment=True, etag=digest,
             mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
         )
     except Exception as e:
@@ -402,7 +392,58 @@ def download_resume(resume_id):
         return f"Error: {str(e)}", 500
 
 
+@applicant_bp.route("/download-resume/<int:resume_id>/pdf")
+def download_resume_pdf(resume_id):
+    if "user_id" not in session:
+        return redirect("/login")
+
+    try:
+        conn = get_db()
+        cur  = conn.cursor()
+        cur.execute("SELECT content, user_id FROM resumes WHERE id = ? AND user_id = ?",
+                    (resume_id, session["user_id"]))
+        result = cur.fetchone()
+
+        if not result:
+            return "Resume not found", 404
+
+        content, user_id = result
+        # 🖨️ Rendered in the PDF pool once per resume text
+        path, digest = resume_pdf.cached_pdf(resume_id, content)
+
+        filename = f"Resume_{user_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+        return send_private_file(path, filename, as_attachment=True, etag=digest,
+                                 mimetype='application/pdf')
+    except resume_pdf.RenderBusy as e:   # also RenderTimeout
+        return str(e), 503, {"Retry-After": "5"}
+    except resume_pdf.UnsupportedText:
+        # Characters the PDF fonts lack; the DOCX keeps them
+        return redirect(f"/applicant/download-resume/{resume_id}")
+    except Exception as e:
+        print(f"PDF export error: {e}")
+        return f"Error: {str(e)}", 500
+
+
 # ── View Jobs ──────────────────────────────────────────────────────
+def jobs_page_query(job_type, after, size):
+    """(sql, params) for one page of /applicant/jobs."""
+    where, params = [], []
+    if job_type:
+        where.append("type = ?")  # 👈 USE type here
+        params.append(job_type)
+    if after:
+        where.append("(created_ts, id) < (?, ?)")
+        params.extend(after)
+
+    return f"""
+        SELECT *
+        FROM jobs
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY created_ts DESC, id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
 @applicant_bp.route("/jobs")
 def view_jobs():
 
@@ -411,31 +452,159 @@ def view_jobs():
 
     user_id = session["user_id"]
 
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    if request.args.get("ranked") == "1":
+        return ranked_jobs(user_id)
 
-    # Get preference
-    cur.execute("""
-        SELECT job_type
-        FROM user_preferences
-        WHERE user_id = ?
-    """, (user_id,))
-    pref = cur.fetchone()
+    if request.args.get("match") == "skills":
+        return skill_matched_jobs(user_id)
+
+    conn = get_db()
+    cur = conn.cursor()
 
-    if pref:
+    # Filter on ?type=, defaulting to the saved preference
+    job_type = request.args.get("type")
+    if job_type is None:
         cur.execute("""
-            SELECT *
-            FROM jobs
-            WHERE type = ?
-        """, (pref["job_type"],))  # 👈 USE type here
-    else:
-        cur.execute("SELECT * FROM jobs")
+            SELECT job_type
+            FROM user_preferences
+            WHERE user_id = ?
+        """, (user_id,))
+        pref = cur.fetchone()
+        job_type = pref["job_type"] if pref else ""
+
+    size  = page_size()
+    after = page_cursor(2)
+
+    query = match_query(request.args.get("q"))
+    if query:
+        return search_jobs(cur, query, job_type, size, after)
+
+    cur.execute(*jobs_page_query(job_type, after, size))
+
+    jobs = Page(cur.fetchall(), size, key=lambda row: (row["created_ts"], row["id"]))
+
+    return render_template("applicant/job_list.html", jobs=jobs, job_type=job_type)
+
+
+def search_jobs_query(query, job_type, after, size):
+    """(sql, params) for one page of full-text job search results."""
+    where, params = [], [HIT_START, HIT_END, HIT_START, HIT_END, query]
+    if job_type:
+        where.append("jobs.type = ?")
+        params.append(job_type)
+    if after:
+        where.append("(hits.score, hits.id) > (?, ?)")
+        params.extend(after)
+
+    return f"""
+        SELECT jobs.*, hits.score, hits.role_hl, hits.snippet
+        FROM (
+            SELECT rowid AS id,
+                   CAST(bm25(jobs_fts, 10.0, 1.0, 5.0) * {SCORE_SCALE} AS INTEGER) AS score,
+                   highlight(jobs_fts, 0, ?, ?) AS role_hl,
+                   snippet(jobs_fts, 1, ?, ?, '…', 24) AS snippet
+            FROM jobs_fts
+            WHERE jobs_fts MATCH ?
+        ) AS hits
+        JOIN jobs ON jobs.id = hits.id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY hits.score, hits.id
+        LIMIT ?
+    """, params + [size + 1]
+
+
+def search_jobs(cur, query, job_type, size, after):
+    """
+    /applicant/jobs?q=...[&type=...]
+    Full-text search over role, description and company name (jobs_fts),
+    best bm25 match first; a hit in the role weighs most.
+    """
+    cur.execute(*search_jobs_query(query, job_type, after, size))
+
+    jobs = Page(cur.fetchall(), size, key=lambda row: (row["score"], row["id"]))
+    highlights = {
+        job["id"]: {"role": marked(job["role_hl"]), "snippet": marked(job["snippet"])}
+        for job in jobs
+    }
+
+    return render_template("applicant/job_list.html", jobs=jobs, job_type=job_type,
+                           search=request.args.get("q", "").strip(),
+                           highlights=highlights)
+
 
-    jobs = cur.fetchall()
-    conn.close()
+def ranked_jobs(user_id):
+    """
+    /applicant/jobs?ranked=1[&k=N][&format=json]
+    Top-K jobs for the applicant's latest resume, best match first.
+    """
+    k = request.args.get("k", RECOMMENDED_JOBS_LIMIT, type=int)
+    k = max(1, min(k, RECOMMENDED_JOBS_MAX))
+
+    conn = get_db()
+    cur = conn.cursor()
+
+    cur.execute(LATEST_RESUME_SQL, (user_id,))
+    resume = cur.fetchone()
+
+    jobs, scores = [], {}
+    if resume and resume["content"]:
+        from nlp.job_matcher import get_job_index
+        ranking = get_job_index().top_k(resume["content"], k)
+        scores  = {job_id: round(score * 100) for job_id, score in ranking}
+
+        # Only hydrate the K winning rows, then restore ranking order
+        if ranking:
+            placeholders = ",".join("?" * len(ranking))
+            cur.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})",
+                        [job_id for job_id, _ in ranking])
+            rows = {row["id"]: row for row in cur.fetchall()}
+            jobs = [rows[job_id] for job_id, _ in ranking if job_id in rows]
+
+    if request.args.get("format") == "json":
+        return jsonify({
+            "has_resume": bool(resume),
+            "jobs": [dict(job, match=scores[job["id"]]) for job in jobs]
+        })
+
+    return render_template("applicant/job_list.html", jobs=jobs, scores=scores,
+                           ranked=True, has_resume=bool(resume))
+
+def skill_matched_jobs(user_id):
+    """
+    /applicant/jobs?match=skills[&min=N][&k=N][&format=json]
+    Jobs sharing at least N skills with the applicant's latest resume,
+    most shared skills first.
+    """
+    min_matches = max(1, request.args.get("min", SKILL_MATCH_MIN, type=int))
+    k = request.args.get("k", RECOMMENDED_JOBS_LIMIT, type=int)
+    k = max(1, min(k, RECOMMENDED_JOBS_MAX))
+
+    resume_id = latest_resume_id(user_id)
+
+    jobs, matched = [], {}
+    if resume_id:
+        hits    = jobs_matching_resume(resume_id, min_matches, k)
+        matched = {job_id: names for job_id, _, names in hits}
+
+        if hits:
+            conn = get_db()
+            cur  = conn.cursor()
+            cur.execute(f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(hits))})",
+                        list(matched))
+            rows = {row["id"]: row for row in cur.fetchall()}
+            jobs = [rows[job_id] for job_id in matched if job_id in rows]
+
+    if request.args.get("format") == "json":
+        return jsonify({
+            "has_resume": bool(resume_id),
+            "jobs": [dict(job, matched_skills=matched[job["id"]].split(", "))
+                     for job in jobs]
+        })
+
+    return render_template("applicant/job_list.html", jobs=jobs, matched=matched,
+                           skill_match=True, min_matches=min_matches,
+                           has_resume=bool(resume_id))
 
-    return render_template("applicant/job_list.html", jobs=jobs)
 # ── Apply for Job ──────────────────────────────────────────────────
 @applicant_bp.route("/apply/<int:job_id>", methods=["GET", "POST"])
 def apply(job_id):
@@ -453,26 +622,21 @@ def apply(job_id):
         return redirect("/auth/login")
 
     # Fetch job details
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur  = conn.cursor()
     cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
     job = cur.fetchone()
 
     if not job:
-        conn.close()
         return redirect("/applicant/jobs")
 
     # Check if already applied (for GET & POST both)
-    cur.execute(
-        "SELECT id FROM applications WHERE user_id=? AND job_id=?",
-        (user_id, job_id)
-    )
+    cur.execute(ALREADY_APPLIED_SQL, (user_id, job_id))
     already = cur.fetchone()
 
     if request.method == "POST":
 
         if already:
-            conn.close()
             flash("⚠️ You have already applied for this job.", "warning")
             return redirect(f"/applicant/apply/{job_id}")
 
@@ -482,34 +646,71 @@ def apply(job_id):
         education    = request.form.get("education", "").strip()
         cover_letter = request.form.get("cover_letter", "").strip()
         resume       = request.files.get("resume")
+        built_id     = request.form.get("built_resume_id", type=int)
 
         if not full_name or not email or not phone:
-            conn.close()
             flash("⚠️ Full name, email and phone are required.", "danger")
             return redirect(f"/applicant/apply/{job_id}")
 
         resume_filename = None
+        resume_blob     = None
 
-        if resume and resume.filename != "":
+        if built_id:
+            # 🖨️ Attach the built resume's cached PDF (or DOCX, see below); rendered at most once per version
+            cur.execute("""
+                SELECT content FROM resumes
+                WHERE id = ? AND user_id = ? AND origin = 'builder' AND status = 'done'
+            """, (built_id, user_id))
+            built = cur.fetchone()
+            if not built:
+                flash("⚠️ Built resume not found.", "danger")
+                return redirect(f"/applicant/apply/{job_id}")
+
+            try:
+                resume_path, _ = resume_pdf.cached_pdf(built_id, built[0])
+                resume_ext     = "pdf"
+            except resume_pdf.UnsupportedText:
+                # Characters the PDF fonts lack; the DOCX keeps them
+                resume_path, _ = resume_docx.cached_docx(built_id, built[0])
+                resume_ext     = "docx"
+            except resume_pdf.RenderBusy as e:   # also RenderTimeout
+                flash(f"⚠️ {e}", "warning")
+                return redirect(f"/applicant/apply/{job_id}")
+            except Exception as e:
+                print(f"PDF export error: {e}")
+                flash("⚠️ Could not export your resume, please try again.", "danger")
+                return redirect(f"/applicant/apply/{job_id}")
+
+            resume_filename = f"{user_id}_{job_id}_resume_{built_id}.{resume_ext}"
+            resume_blob     = blob_store.put_file(cur, resume_path)
+
+        elif resume and resume.filename != "":
             if not allowed_file(resume.filename):
-                conn.close()
                 flash("⚠️ Invalid file. Upload PDF, DOCX, or TXT only.", "danger")
                 return redirect(f"/applicant/apply/{job_id}")
 
             resume_filename = f"{user_id}_{job_id}_{secure_filename(resume.filename)}"
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-            resume.save(os.path.join(UPLOAD_FOLDER, resume_filename))
+            file_ext = resume_filename.rsplit('.', 1)[1].lower()
+
+            try:
+                temp_path, resume_blob, size = store_upload(resume, blob_store.temp_dir(), file_ext)
+            except UploadError as e:
+                flash(str(e), "danger")
+                return redirect(f"/applicant/apply/{job_id}")
+
+            # 🗄️ Stored once per content, however many jobs it is sent to
+            blob_store.put_temp(cur, temp_path, resume_blob, size)
             print("✅ Resume saved:", resume_filename)
 
         try:
             cur.execute("""
                 INSERT INTO applications
                   (user_id, job_id, status, full_name, email, phone,
-                   education, cover_letter, resume_filename)
-                VALUES (?, ?, 'Applied', ?, ?, ?, ?, ?, ?)
+                   education, cover_letter, resume_filename, resume_blob)
+                VALUES (?, ?, 'Applied', ?, ?, ?, ?, ?, ?, ?)
             """, (
                 user_id, job_id, full_name, email, phone,
-                education, cover_letter, resume_filename
+                education, cover_letter, resume_filename, resume_blob
             ))
 
             cur.execute(
@@ -518,23 +719,27 @@ def apply(job_id):
             )
 
             conn.commit()
-            conn.close()
 
             flash("✅ Application submitted successfully!", "success")
             return redirect("/applicant/jobs")
 
         except Exception as e:
-            conn.close()
+            conn.rollback()
             flash(f"⚠️ Database error: {str(e)}", "danger")
             return redirect(f"/applicant/apply/{job_id}")
 
-    conn.close()
+    cur.execute(BUILT_RESUMES_SQL, (user_id,))
+    built_resumes = [
+        {"id": row[0], "title": (row[1] or "").split("\n")[0].strip() or "Untitled"}
+        for row in cur.fetchall()
+    ]
 
     return render_template(
         "applicant/apply_job.html",
         job=job,
         job_id=job_id,
-        already_applied=bool(already)
+        already_applied=bool(already),
+        built_resumes=built_resumes
     )
 
 # ══════════════════════════════════════════════════════════════════
@@ -679,58 +884,3 @@ def generate_professional_resume(data):
                 content += "\n"
 
     return content
-
-
-def create_professional_docx(content):
-    doc = Document()
-
-    for section in doc.sections:
-        section.top_margin    = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin   = Inches(0.75)
-        section.right_margin  = Inches(0.75)
-
-    SECTION_HEADERS = [
-        'Professional Summary', 'Education', 'Technical Skills',
-        'Projects', 'Professional Experience', 'Certifications'
-    ]
-
-    for i, line in enumerate(content.split('\n')):
-        if not line.strip():
-            continue
-
-        if i == 0:
-            p = doc.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = p.add_run(line)
-            run.font.size = Pt(18)
-            run.font.bold = True
-            run.font.color.rgb = RGBColor(0, 0, 0)
-
-        elif i == 1:
-            p = doc.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = p.add_run(line)
-            run.font.size = Pt(10)
-
-        elif line in SECTION_HEADERS:
-            p = doc.add_paragraph()
-            run = p.add_run(line.upper())
-            run.font.size = Pt(12)
-            run.font.bold = True
-            run.font.color.rgb = RGBColor(31, 78, 121)
-            p.paragraph_format.space_before = Pt(10)
-            p.paragraph_format.space_after  = Pt(6)
-
-        elif line.strip().startswith('•') or line.strip().startswith('-'):
-            p = doc.add_paragraph(line.strip(), style='List Bullet')
-            p.paragraph_format.left_indent = Inches(0.25)
-            if p.runs:
-                p.runs[0].font.size = Pt(10)
-
-        else:
-            p   = doc.add_paragraph(line)
-            run = p.runs[0] if p.runs else p.add_run(line)
-            run.font.size = Pt(10)
-
-    return doc
\ No newline at end of file
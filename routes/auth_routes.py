@@ -1,6 +1,5 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, session
-import sqlite3
-from config import DATABASE
+from database.db import get_db
 from models.user_model import create_user, get_user
 from functools import wraps
 
@@ -48,12 +47,14 @@ def _redirect_by_role(role):
     return redirect(routes.get(role, "/login"))
 
 
+COMPANY_DETAILS_SQL = "SELECT * FROM company_details WHERE user_id = ?"
+
+
 def _load_company_session(user_id):
     """Load company_details into session if available."""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db() as conn:
         cur = conn.cursor()
-        cur.execute("SELECT * FROM company_details WHERE user_id = ?", (user_id,))
+        cur.execute(COMPANY_DETAILS_SQL, (user_id,))
         details = cur.fetchone()
         if details:
             session["company_name"] = details["company_name"]
@@ -1,13 +1,55 @@
-from flask import Blueprint, render_template, request, redirect, send_file, session,send_from_directory
-import sqlite3
+from flask import Blueprint, render_template, request, redirect, session
+import json
 import os
-from config import DATABASE
+from database.db import get_db
+from database.pagination import Page, page_cursor, page_size
+from database.search import HIT_END, HIT_START, SCORE_SCALE, boolean_query, marked
+from models.stats_model import company_dashboard_stats
+from models.skill_model import parse_skills, resumes_with_all_skills
+from nlp.skill_extractor import extract_skills
+from services import blob_store
+from services.downloads import send_private_file
 
 company_bp = Blueprint("company", __name__, url_prefix="/company")
 
-# Absolute upload path (matches applicant upload folder)
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_FOLDER = os.path.join(BASE_DIR, '..', 'uploads')
+# Fixed queries and the page builders below are also explained by
+# database/check_query_plans.py
+PROFILE_SQL = """
+    SELECT users.name, users.email, company_details.*
+    FROM users
+    JOIN company_details
+    ON users.id = company_details.user_id
+    WHERE users.id = ?
+"""
+
+# Each applicant is matched on their latest resume, falling back to
+# what they typed into the application form.
+RANKED_APPLICATIONS_SQL = """
+    SELECT
+        applications.id,
+        applications.full_name,
+        ? AS role,
+        applications.status,
+        applications.resume_filename,
+        applications.job_id,
+        COALESCE(
+            (SELECT content FROM resumes
+             WHERE resumes.user_id = applications.user_id
+               AND resumes.status = 'done'
+             ORDER BY resumes.id DESC LIMIT 1),
+            COALESCE(applications.education, '') || ' ' ||
+            COALESCE(applications.cover_letter, '')
+        ) AS resume_text
+    FROM applications
+    WHERE applications.job_id = ?
+"""
+
+VIEW_RESUME_SQL = """
+    SELECT applications.resume_filename, applications.resume_blob
+    FROM applications
+    INNER JOIN jobs ON applications.job_id = jobs.id
+    WHERE applications.id = ? AND jobs.company_id = ?
+"""
 
 
 # ======================================
@@ -27,7 +69,7 @@ def add_details():
         location = request.form["location"]
         description = request.form["description"]
 
-        with sqlite3.connect(DATABASE, timeout=10) as conn:
+        with get_db() as conn:
             cur = conn.cursor()
             cur.execute("""
                 INSERT INTO company_details
@@ -59,8 +101,7 @@ def dashboard():
 
     company_id = session["user_id"]
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db() as conn:
         cur = conn.cursor()
 
         # 🔎 Check if company details exist
@@ -75,34 +116,14 @@ def dashboard():
         session["company_name"] = details["company_name"]
         session["verified"] = details["verified"]
 
-        # 📊 Count only this company's jobs
-        cur.execute("SELECT COUNT(*) FROM jobs WHERE company_id = ?", (company_id,))
-        active_jobs = cur.fetchone()[0]
-
-        # 👥 Count applicants for this company's jobs
-        cur.execute("""
-            SELECT COUNT(*) FROM applications
-            WHERE job_id IN (
-                SELECT id FROM jobs WHERE company_id = ?
-            )
-        """, (company_id,))
-        total_applicants = cur.fetchone()[0]
-
-        # ⭐ Shortlisted count
-        cur.execute("""
-            SELECT COUNT(*) FROM applications
-            WHERE status = 'Shortlisted'
-            AND job_id IN (
-                SELECT id FROM jobs WHERE company_id = ?
-            )
-        """, (company_id,))
-        shortlisted = cur.fetchone()[0]
+    # 📊 Jobs, applicants and shortlisted in one aggregate
+    stats = company_dashboard_stats(company_id)
 
     return render_template(
         "company/dashboard.html",
-        active_jobs=active_jobs,
-        total_applicants=total_applicants,
-        shortlisted=shortlisted
+        active_jobs=stats["active_jobs"],
+        total_applicants=stats["total_applicants"],
+        shortlisted=stats["shortlisted"]
     )
 # ======================================
 # Post Job
@@ -117,8 +138,7 @@ def post_job():
     company_id = session["user_id"]
 
     # 🔎 Check verification status
-    with sqlite3.connect(DATABASE, timeout=10) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db() as conn:
         cur = conn.cursor()
 
         cur.execute("SELECT verified FROM company_details WHERE user_id = ?", (company_id,))
@@ -133,6 +153,7 @@ def post_job():
 
         # ✅ If POST and verified → allow insert
         if request.method == "POST":
+            from nlp.job_matcher import get_job_index, job_document
 
             role = request.form["role"]
             vacancy = request.form["vacancy"]
@@ -141,10 +162,13 @@ def post_job():
             experience = request.form["experience"]
             description = request.form["desc"]
 
+            # 🧩 Stored as JSON; triggers index it into job_skills
+            skills = extract_skills(job_document(role, description))
+
             cur.execute("""
                 INSERT INTO jobs 
-                (role, company_name, company_id, vacancy, type, salary, experience, description) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (role, company_name, company_id, vacancy, type, salary, experience, description, skills) 
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 role,
                 session["company_name"],
@@ -153,11 +177,19 @@ def post_job():
                 job_type,
                 salary,
                 experience,
-                description
+                description,
+                json.dumps(skills)
             ))
+            job_id = cur.lastrowid
 
             conn.commit()
 
+            # Keep the matching index in step with the jobs table
+            try:
+                get_job_index().add_job(job_id, job_document(role, description))
+            except Exception as e:
+                print(f"Job index error: {e}")
+
             return render_template(
                 "company/post_job.html",
                 message="✅ Job Posted Successfully!"
@@ -174,17 +206,10 @@ def profile():
     if session.get("role") != "company":
         return redirect("/login")
 
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db() as conn:
         cur = conn.cursor()
 
-        cur.execute("""
-            SELECT users.name, users.email, company_details.*
-            FROM users
-            JOIN company_details
-            ON users.id = company_details.user_id
-            WHERE users.id = ?
-        """, (session["user_id"],))
+        cur.execute(PROFILE_SQL, (session["user_id"],))
 
         company = cur.fetchone()
 
@@ -202,7 +227,7 @@ def update_company_profile():
     name = request.form["company_name"]
     email = request.form["email"]
 
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur = conn.cursor()
 
     # 🔥 Update USERS table (not companies)
@@ -213,7 +238,6 @@ def update_company_profile():
     """, (name, email, session["user_id"]))
 
     conn.commit()
-    conn.close()
 
     # 🔥 Update session so navbar shows new name instantly
     session["company_name"] = name
@@ -223,6 +247,83 @@ def update_company_profile():
 # ======================================
 # View All Applications
 # ======================================
+def applications_filter(company_id, status, job_id, skills):
+    """(where, params) shared by the list and the search of /company/applications."""
+    where, params = ["jobs.company_id = ?"], [company_id]
+    if status:
+        where.append("applications.status = ?")
+        params.append(status)
+    if job_id:
+        where.append("applications.job_id = ?")
+        params.append(job_id)
+
+    # ?skills=python, sql → applicants whose latest resume has all of them
+    if skills:
+        having_all, having_params = resumes_with_all_skills(skills)
+        where.append(f"""
+            (SELECT id FROM resumes
+             WHERE resumes.user_id = applications.user_id AND resumes.status = 'done'
+             ORDER BY id DESC LIMIT 1) IN ({having_all})
+        """)
+        params.extend(having_params)
+
+    return where, params
+
+
+def applications_query(where, params, after, size):
+    """(sql, params) for one page of /company/applications."""
+    if after:
+        where = where + ["applications.id < ?"]
+        params = params + list(after)
+
+    return f"""
+        SELECT 
+            applications.id,
+            applications.full_name,
+            jobs.role,
+            applications.status,
+            applications.resume_filename,
+            jobs.id
+        FROM applications
+        INNER JOIN jobs 
+            ON applications.job_id = jobs.id
+        WHERE {" AND ".join(where)}
+        ORDER BY applications.id DESC
+        LIMIT ?
+    """, params + [size + 1]
+
+
+def search_applications_query(query, where, params, after, size):
+    """(sql, params) for one page of /company/applications?q=..."""
+    if after:
+        where = where + ["(hits.score, hits.id) > (?, ?)"]
+        params = params + list(after)
+
+    return f"""
+        SELECT
+            applications.id,
+            applications.full_name,
+            jobs.role,
+            applications.status,
+            applications.resume_filename,
+            jobs.id,
+            hits.score,
+            hits.snippet
+        FROM (
+            SELECT rowid AS id,
+                   CAST(bm25(candidates_fts, 5.0, 2.0, 1.0, 1.0) * {SCORE_SCALE} AS INTEGER) AS score,
+                   snippet(candidates_fts, -1, ?, ?, '…', 24) AS snippet
+            FROM candidates_fts
+            WHERE candidates_fts MATCH ?
+        ) AS hits
+        INNER JOIN applications ON applications.id = hits.id
+        INNER JOIN jobs ON applications.job_id = jobs.id
+        WHERE {" AND ".join(where)}
+        ORDER BY hits.score, hits.id
+        LIMIT ?
+    """, [HIT_START, HIT_END, query] + params + [size + 1]
+
+
 @company_bp.route("/applications")
 def view_applications():
 
@@ -232,60 +333,104 @@ def view_applications():
 
     company_id = session["user_id"]   # Logged in company
 
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
+    size   = page_size()
+    after  = page_cursor(1)
+    status = request.args.get("status", "")
+    job_id = request.args.get("job_id", type=int)
+    skills = parse_skills(request.args.get("skills"))
+
+    where, params = applications_filter(company_id, status, job_id, skills)
+
+    conn = get_db()
     cur = conn.cursor()
 
-    cur.execute("""
-        SELECT 
-            applications.id,
-            applications.full_name,
-            jobs.role,
-            applications.status,
-            applications.resume_filename
-        FROM applications
-        INNER JOIN jobs 
-            ON applications.job_id = jobs.id
-        WHERE jobs.company_id = ?
-        ORDER BY applications.id DESC
-    """, (company_id,))
+    # Company's jobs for the job filter
+    cur.execute("SELECT id, role FROM jobs WHERE company_id = ? ORDER BY id DESC", (company_id,))
+    jobs = cur.fetchall()
 
-    data = cur.fetchall()
-    conn.close()
+    query = boolean_query(request.args.get("q"))
+    if query:
+        return search_applications(cur, query, where, params, size, after, jobs)
 
-    return render_template("company/applicants_list.html", data=data)
+    cur.execute(*applications_query(where, params, after, size))
+
+    data = Page(cur.fetchall(), size, key=lambda row: (row[0],))
+
+    return render_template("company/applicants_list.html", data=data, jobs=jobs)
+
+
+def search_applications(cur, query, where, params, size, after, jobs):
+    """
+    /company/applications?q=...
+    Full-text search over the company's own applicants: application
+    form fields plus each applicant's latest resume (candidates_fts).
+    Best bm25 match first, with a highlighted snippet of the best
+    matching field.
+    """
+    cur.execute(*search_applications_query(query, where, params, after, size))
+
+    data = Page(cur.fetchall(), size, key=lambda row: (row["score"], row[0]))
+    snippets = {row[0]: marked(row["snippet"]) for row in data}
+
+    return render_template("company/applicants_list.html", data=data, jobs=jobs,
+                           search=request.args.get("q", "").strip(),
+                           snippets=snippets)
 
 
-@company_bp.route("/view-resume/<filename>")
-def view_resume_file(filename):
-    return send_from_directory("uploads", filename)
 # ======================================
-# Delete Application
+# Rank Applicants For A Job
 # ======================================
-@company_bp.route("/delete-application/<int:app_id>")
-def delete_application(app_id):
+@company_bp.route("/applications/<int:job_id>/ranked")
+def ranked_applications(job_id):
 
-    conn = sqlite3.connect(DATABASE)
+    if session.get("role") != "company":
+        return redirect("/login")
+
+    company_id = session["user_id"]
+
+    conn = get_db()
     cur = conn.cursor()
 
-    # Optional: get resume filename before delete
-    cur.execute("SELECT resume_filename FROM applications WHERE id = ?", (app_id,))
-    result = cur.fetchone()
+    cur.execute(
+        "SELECT id, role, description FROM jobs WHERE id = ? AND company_id = ?",
+        (job_id, company_id)
+    )
+    job = cur.fetchone()
+
+    if not job:
+        return redirect("/company/applications")
+
+    cur.execute(RANKED_APPLICATIONS_SQL, (job["role"], job_id))
 
-    if result:
-        resume_file = result[0]
+    rows = {row["id"]: row for row in cur.fetchall()}
 
-        # Delete record
-        cur.execute("DELETE FROM applications WHERE id = ?", (app_id,))
-        conn.commit()
+    from nlp.job_matcher import job_document, rank_candidates
+    ranking = rank_candidates(
+        job_id,
+        job_document(job["role"], job["description"]),
+        [(app_id, row["resume_text"]) for app_id, row in rows.items()]
+    )
+
+    data   = [rows[app_id] for app_id, _ in ranking]
+    scores = {app_id: round(score * 100) for app_id, score in ranking}
+
+    return render_template("company/applicants_list.html",
+                           data=data, scores=scores, job=job)
+
+
+# ======================================
+# Delete Application
+# ======================================
+@company_bp.route("/delete-application/<int:app_id>")
+def delete_application(app_id):
 
-        # Delete resume file from uploads (optional)
-        if resume_file:
-            file_path = os.path.join(UPLOAD_FOLDER, resume_file)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+    conn = get_db()
+    cur = conn.cursor()
 
-    conn.close()
+    # Delete record; a trigger releases its resume blob and the
+    # sweeper (services/sweeper.py) removes the file once unused
+    cur.execute("DELETE FROM applications WHERE id = ?", (app_id,))
+    conn.commit()
 
     return redirect("/company/applications")
 
@@ -294,15 +439,30 @@ def delete_application(app_id):
 # ======================================
 # View Resume
 # ======================================
-@company_bp.route("/view-resume/<filename>")
-def view_resume(filename):
+@company_bp.route("/applications/<int:app_id>/resume")
+def view_resume(app_id):
+
+    # 🔐 Only the company that posted the job sees the resume
+    if session.get("role") != "company":
+        return redirect("/login")
+
+    conn = get_db()
+    cur = conn.cursor()
+
+    cur.execute(VIEW_RESUME_SQL, (app_id, session["user_id"]))
+    row = cur.fetchone()
 
-    file_path = os.path.join(UPLOAD_FOLDER, filename)
+    # Same answer for "not yours" and "no such application"
+    if not row or not row["resume_blob"]:
+        return "Resume not found", 404
 
-    if os.path.exists(file_path):
-        return send_file(file_path)
+    file_path = blob_store.blob_path(row["resume_blob"])
+    if not os.path.isfile(file_path):
+        return "Resume not found", 404
 
-    return "Resume not found", 404
+    # 📄 Inline under its uploaded name (which also gives the type), with
+    # ETag / Range support or proxy offload (services/downloads.py)
+    return send_private_file(file_path, download_name=row["resume_filename"])
 
 
 # ======================================
@@ -316,7 +476,7 @@ def update_status(app_id, status):
     if status not in allowed_status:
         return "Invalid status"
 
-    conn = sqlite3.connect(DATABASE)
+    conn = get_db()
     cur = conn.cursor()
 
     cur.execute(
@@ -325,6 +485,5 @@ def update_status(app_id, status):
     )
 
     conn.commit()
-    conn.close()
 
     return redirect("/company/applications")
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+from config import BLOB_STORE_DIR, BLOB_GC_GRACE_SECONDS
+
+# ══════════════════════════════════════════════════════════════════
+# CONTENT-ADDRESSED BLOB STORE
+#
+# Uploaded files are stored once per content, at
+# BLOB_STORE_DIR/ab/cd/<sha256>, however many applications or resumes
+# use them. The blobs table holds one row per stored file. Its refs
+# column is kept by triggers on applications.resume_blob and
+# resumes.source_blob (database/migrations.py, step 10), so callers only
+# put files and set those columns.
+#
+# Files arrive as a temp file in the store's tmp/ directory and are
+# renamed into place, so a blob path never shows a partial file. Putting
+# a blob touches its row first, inside the caller's write transaction.
+# collect_garbage() only removes blobs that are unreferenced and have not
+# been touched for BLOB_GC_GRACE_SECONDS, and holds the write lock while
+# it deletes, so a blob that is being re-uploaded is never removed. It
+# and the file sweeps below are run by services/sweeper.py.
+# ══════════════════════════════════════════════════════════════════
+
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_path(sha256):
+    return os.path.join(BLOB_STORE_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def temp_dir():
+    """Where uploads are spooled before put_temp(); same filesystem as the blobs."""
+    path = os.path.join(BLOB_STORE_DIR, "tmp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _touch(cur, sha256, size):
+    cur.execute("""
+        INSERT INTO blobs (sha256, size, refs, touched_ts) VALUES (?, ?, 0, ?)
+        ON CONFLICT(sha256) DO UPDATE SET touched_ts = excluded.touched_ts
+    """, (sha256, size, int(time.time())))
+
+
+def put_temp(cur, temp_path, sha256, size):
+    """
+    Move a temp file from temp_dir(), already hashed, into the store.
+    If the blob exists the temp file is dropped instead. Returns the
+    blob's path. The caller commits (and sets a reference column).
+    """
+    _touch(cur, sha256, size)
+
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    return path
+
+
+def file_digest(path):
+    """(sha256 hex, size) of a file, read in chunks."""
+    digest = hashlib.sha256()
+    size   = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def put_file(cur, src):
+    """
+    Store a copy of an existing file (a hard link where possible).
+    Returns its sha256; src itself is left alone.
+    """
+    sha256, size = file_digest(src)
+    _touch(cur, sha256, size)
+    if os.path.exists(blob_path(sha256)):
+        return sha256
+
+    tmp = os.path.join(temp_dir(), f"{uuid.uuid4().hex}.part")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    put_temp(cur, tmp, sha256, size)
+    return sha256
+
+
+GARBAGE_SQL = """
+    SELECT sha256, size FROM blobs
+    WHERE refs = 0 AND touched_ts < ?
+    LIMIT ?
+"""
+
+
+def collect_garbage(conn, limit=500):
+    """
+    Delete unreferenced blobs past the grace period.
+    Returns (blobs removed, bytes freed).
+    """
+    cutoff = int(time.time()) - BLOB_GC_GRACE_SECONDS
+    cur = conn.cursor()
+    try:
+        # Hold the write lock until the files are gone: a concurrent
+        # put_temp() waits, then finds no file and writes it again
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(GARBAGE_SQL, (cutoff, limit))
+        doomed = cur.fetchall()
+
+        cur.executemany("DELETE FROM blobs WHERE sha256 = ?", [(sha256,) for sha256, _ in doomed])
+        for sha256, _ in doomed:
+            try:
+                os.remove(blob_path(sha256))
+            except OSError:
+                pass
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(doomed), sum(size for _, size in doomed)
+
+
+def _stored_files():
+    """(sha256, path) of every file in the blob shards."""
+    if not os.path.isdir(BLOB_STORE_DIR):
+        return
+    for outer in os.scandir(BLOB_STORE_DIR):
+        # Shards are two hex digits; skips tmp/
+        if len(outer.name) != 2 or not outer.is_dir():
+            continue
+        for inner in os.scandir(outer.path):
+            if inner.is_dir():
+                for entry in os.scandir(inner.path):
+                    yield entry.name, entry.path
+
+
+def remove_orphan_files(conn, limit=500):
+    """
+    Delete stored files that have no blobs row, e.g. left by a request
+    whose transaction rolled back after put_temp(). Only files older than
+    the grace period are considered, and each is re-checked under the
+    write lock. Returns (files removed, bytes freed).
+    """
+    cutoff = time.time() - BLOB_GC_GRACE_SECONDS
+    cur    = conn.cursor()
+    removed, freed = 0, 0
+
+    candidates = []
+    for sha256, path in _stored_files():
+        cur.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,))
+        if cur.fetchone() is None:
+            candidates.append((sha256, path))
+
+    for start in range(0, len(candidates), limit):
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for sha256, path in candidates[start:start + limit]:
+                cur.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,))
+                if cur.fetchone() is not None:
+                    continue
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime >= cutoff:
+                        continue
+                    os.remove(path)
+                except OSError:
+                    continue
+                removed += 1
+                freed   += stat.st_size
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return removed, freed
+
+
+def remove_stale_temp():
+    """Delete upload temp files abandoned for longer than the grace period."""
+    cutoff = time.time() - BLOB_GC_GRACE_SECONDS
+    removed, freed = 0, 0
+    path = os.path.join(BLOB_STORE_DIR, "tmp")
+    if not os.path.isdir(path):
+        return removed, freed
+    for entry in os.scandir(path):
+        try:
+            stat = entry.stat()
+            if not entry.is_file() or stat.st_mtime >= cutoff:
+                continue
+            os.remove(entry.path)
+        except OSError:
+            continue
+        removed += 1
+        freed   += stat.st_size
+    return removed, freed
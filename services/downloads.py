@@ -0,0 +1,58 @@
+import os
+from urllib.parse import quote
+
+from flask import current_app, request
+from werkzeug.utils import send_file
+
+from config import SENDFILE_MODE, SENDFILE_URL_PREFIX, UPLOADS_ROOT
+
+# ══════════════════════════════════════════════════════════════════
+# PRIVATE FILE DOWNLOADS
+#
+# Resumes and rendered downloads are only served after the route has
+# checked who is asking. From there the transfer is either streamed by
+# werkzeug (ETag, Last-Modified, 304s and Range requests for partial
+# PDF loads) or, with SENDFILE_MODE set, handed to the front proxy so
+# a large file never ties up a Python worker. The proxy then does its
+# own conditional and range handling.
+# ══════════════════════════════════════════════════════════════════
+
+SENDFILE_MODES = (None, "x-sendfile", "x-accel-redirect")
+
+if SENDFILE_MODE not in SENDFILE_MODES:
+    raise ValueError(f"SENDFILE_MODE must be one of {SENDFILE_MODES}, not {SENDFILE_MODE!r}")
+
+
+def send_private_file(path, download_name=None, as_attachment=False,
+                      mimetype=None, etag=True):
+    """
+    Response for a file under UPLOADS_ROOT the caller has already
+    authorised. etag may be a precomputed tag (e.g. a content digest);
+    by default one is derived from the file's size and mtime.
+    """
+    path     = os.path.abspath(path)
+    offload  = SENDFILE_MODE is not None
+
+    response = send_file(
+        path,
+        request.environ,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=download_name or os.path.basename(path),
+        conditional=not offload,
+        etag=etag,
+        use_x_sendfile=offload,
+        response_class=current_app.response_class,
+    )
+
+    if SENDFILE_MODE == "x-accel-redirect":
+        # nginx wants a URI of an internal location, not a file path
+        relative = os.path.relpath(path, UPLOADS_ROOT).replace(os.sep, "/")
+        del response.headers["X-Sendfile"]
+        response.headers["X-Accel-Redirect"] = SENDFILE_URL_PREFIX + quote(relative)
+
+    # Personal documents: never stored by shared caches, always revalidated
+    response.cache_control.public   = False
+    response.cache_control.private  = True
+    response.cache_control.no_cache = True
+    return response
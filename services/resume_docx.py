@@ -0,0 +1,154 @@
+import copy
+import glob
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+from config import DOCX_CACHE_DIR
+
+# ══════════════════════════════════════════════════════════════════
+# RESUME DOCX RENDERING
+#
+# Rendered files are kept in DOCX_CACHE_DIR as "<resume id>-<digest>.docx"
+# (and ".pdf", see services/resume_pdf.py), where the digest covers the
+# resume text and RENDER_VERSION. A download only renders when that file
+# is missing; the digest doubles as the ETag, so repeat downloads of an
+# unchanged resume get a 304. The default python-docx template is parsed
+# once per process and deep-copied for each render instead of being
+# re-read from disk.
+# ══════════════════════════════════════════════════════════════════
+
+# Bump when either renderer changes so cached files are re-rendered
+RENDER_VERSION = 1
+
+SECTION_HEADERS = [
+    'Professional Summary', 'Education', 'Technical Skills',
+    'Projects', 'Professional Experience', 'Certifications'
+]
+
+_template      = None
+_template_lock = threading.Lock()
+
+
+def base_document():
+    """A fresh copy of the default template with the resume margins set."""
+    global _template
+    with _template_lock:
+        if _template is None:
+            # python-docx (and lxml under it) is only needed here; importing
+            # it on first use keeps it out of every worker's startup.
+            from docx import Document
+            from docx.shared import Inches
+
+            template = Document()
+            for section in template.sections:
+                section.top_margin    = Inches(0.5)
+                section.bottom_margin = Inches(0.5)
+                section.left_margin   = Inches(0.75)
+                section.right_margin  = Inches(0.75)
+            _template = template
+        return copy.deepcopy(_template)
+
+
+def create_professional_docx(content):
+    from docx.shared import Pt, RGBColor, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = base_document()
+
+    for i, line in enumerate(content.split('\n')):
+        if not line.strip():
+            continue
+
+        if i == 0:
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = p.add_run(line)
+            run.font.size = Pt(18)
+            run.font.bold = True
+            run.font.color.rgb = RGBColor(0, 0, 0)
+
+        elif i == 1:
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = p.add_run(line)
+            run.font.size = Pt(10)
+
+        elif line in SECTION_HEADERS:
+            p = doc.add_paragraph()
+            run = p.add_run(line.upper())
+            run.font.size = Pt(12)
+            run.font.bold = True
+            run.font.color.rgb = RGBColor(31, 78, 121)
+            p.paragraph_format.space_before = Pt(10)
+            p.paragraph_format.space_after  = Pt(6)
+
+        elif line.strip().startswith('•') or line.strip().startswith('-'):
+            p = doc.add_paragraph(line.strip(), style='List Bullet')
+            p.paragraph_format.left_indent = Inches(0.25)
+            if p.runs:
+                p.runs[0].font.size = Pt(10)
+
+        else:
+            p   = doc.add_paragraph(line)
+            run = p.runs[0] if p.runs else p.add_run(line)
+            run.font.size = Pt(10)
+
+    return doc
+
+
+def content_digest(content):
+    text = f"{RENDER_VERSION}\n{content or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_path(resume_id, digest, ext):
+    return os.path.join(DOCX_CACHE_DIR, f"{resume_id}-{digest}.{ext}")
+
+
+def store(resume_id, digest, ext, data):
+    """
+    Write a render to its cache path under a temp name and rename it, so
+    a concurrent download never sees a half-written file. Renders of
+    older versions of the resume are removed.
+    """
+    os.makedirs(DOCX_CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=DOCX_CACHE_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        invalidate(resume_id, keep=digest)
+        os.replace(tmp, cache_path(resume_id, digest, ext))
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def cached_docx(resume_id, content):
+    """
+    (path, digest) of the rendered DOCX for this resume text, rendering
+    and storing it first if needed.
+    """
+    digest = content_digest(content)
+    path   = cache_path(resume_id, digest, "docx")
+    if os.path.exists(path):
+        return path, digest
+
+    buffer = io.BytesIO()
+    create_professional_docx(content or "").save(buffer)
+    store(resume_id, digest, "docx", buffer.getvalue())
+
+    return path, digest
+
+
+def invalidate(resume_id, keep=None):
+    """Drop cached renders of a resume (after its text changed), except version keep."""
+    for path in glob.glob(os.path.join(DOCX_CACHE_DIR, f"{resume_id}-*.*")):
+        if keep and os.path.basename(path).startswith(f"{resume_id}-{keep}."):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
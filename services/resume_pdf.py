@@ -0,0 +1,258 @@
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from functools import partial
+
+from config import PDF_RENDER_WORKERS, PDF_RENDER_QUEUE, PDF_RENDER_TIMEOUT, POOL_START_METHOD
+from services.resume_docx import SECTION_HEADERS, cache_path, content_digest, store
+
+# ══════════════════════════════════════════════════════════════════
+# RESUME PDF EXPORT
+#
+# Built resumes are laid out like create_professional_docx (centred name
+# and contact line, blue section headers, indented bullets) and written
+# as a small PDF using the built-in Helvetica fonts, so nothing has to
+# be installed or embedded. Those fonts only cover WinAnsi (cp1252): a
+# resume with other characters is not rendered at all, cached_pdf raises
+# UnsupportedText and callers serve the DOCX, which keeps them.
+# Rendering runs in a process pool of
+# PDF_RENDER_WORKERS; at most PDF_RENDER_QUEUE further renders wait for
+# it, anything beyond that is refused with RenderBusy. Output is cached
+# next to the DOCX (services/resume_docx.py) under the same digest, so a
+# resume version is rendered once however often it is downloaded or
+# attached to an application.
+# ══════════════════════════════════════════════════════════════════
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842      # A4, in points
+MARGIN_X, MARGIN_Y      = 54, 36        # 0.75in / 0.5in, as in the DOCX
+BULLET_INDENT           = 18            # 0.25in
+LEADING                 = 1.2           # line height as a multiple of font size
+HEADER_COLOR            = (31, 78, 121)
+
+# Advance widths (1/1000 em) of ASCII 32..126 from the standard AFM files;
+# other WinAnsi characters fall back to DEFAULT_WIDTH.
+HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+DEFAULT_WIDTH = 556
+SPECIAL_WIDTHS = {0x95: 350, 0x96: 556, 0x97: 1000}   # bullet, en dash, em dash
+
+FONTS = {False: ("F1", HELVETICA), True: ("F2", HELVETICA_BOLD)}
+
+
+class RenderBusy(RuntimeError):
+    """Too many PDF renders already queued; try again shortly."""
+
+
+class RenderTimeout(RenderBusy):
+    """The render outlived PDF_RENDER_TIMEOUT; it is cached when it finishes."""
+
+
+class UnsupportedText(ValueError):
+    """The resume has characters the built-in fonts cannot show; use the DOCX."""
+
+
+def can_render(content):
+    """True if every character of content is in WinAnsi."""
+    try:
+        content.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+# ── layout ────────────────────────────────────────────────────────
+def _encode(text):
+    """Text as WinAnsi bytes; only text that passed can_render() gets here."""
+    return text.encode("cp1252")
+
+
+def _width(data, size, bold):
+    widths = FONTS[bold][1]
+    total  = 0
+    for byte in data:
+        if 32 <= byte <= 126:
+            total += widths[byte - 32]
+        else:
+            total += SPECIAL_WIDTHS.get(byte, DEFAULT_WIDTH)
+    return total * size / 1000
+
+
+def _wrap(text, size, bold, max_width):
+    """Greedy word wrap; a single word wider than the line is left whole."""
+    lines, line = [], b""
+    for word in _encode(text).split():
+        candidate = line + b" " + word if line else word
+        if line and _width(candidate, size, bold) > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _blocks(content):
+    """(text, size, bold, color, centred, indent, space before, space after) per line."""
+    for i, line in enumerate(content.split("\n")):
+        if not line.strip():
+            continue
+        if i == 0:
+            yield line, 18, True, None, True, 0, 0, 4
+        elif i == 1:
+            yield line, 10, False, None, True, 0, 0, 4
+        elif line in SECTION_HEADERS:
+            yield line.upper(), 12, True, HEADER_COLOR, False, 0, 10, 6
+        elif line.strip().startswith("•") or line.strip().startswith("-"):
+            yield line.strip(), 10, False, None, False, BULLET_INDENT, 0, 2
+        else:
+            yield line, 10, False, None, False, 0, 0, 2
+
+
+def _escape(data):
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _pages(content):
+    """One content stream (bytes) per page."""
+    pages, ops = [], []
+    y = PAGE_HEIGHT - MARGIN_Y
+
+    for text, size, bold, color, centred, indent, before, after in _blocks(content):
+        font, _ = FONTS[bold]
+        height  = size * LEADING
+        left    = MARGIN_X + indent
+        width   = PAGE_WIDTH - MARGIN_X - left
+        y -= before
+
+        for line in _wrap(text, size, bold, width):
+            if y - height < MARGIN_Y:
+                pages.append(b"\n".join(ops))
+                ops, y = [], PAGE_HEIGHT - MARGIN_Y
+            y -= height
+            x = (PAGE_WIDTH - _width(line, size, bold)) / 2 if centred else left
+            r, g, b = (c / 255 for c in (color or (0, 0, 0)))
+            ops.append(b"BT %.3f %.3f %.3f rg /%s %d Tf %.2f %.2f Td (%s) Tj ET"
+                       % (r, g, b, font.encode(), size, x, y + size * 0.2, _escape(line)))
+        y -= after
+
+    pages.append(b"\n".join(ops))
+    return pages
+
+
+# ── file format ───────────────────────────────────────────────────
+def render_pdf(content):
+    """PDF bytes for a built resume's text (UnicodeEncodeError unless can_render)."""
+    streams = _pages(content or "")
+
+    # 1 catalog, 2 page tree, 3-4 fonts, then a page and its contents per page
+    objects = [
+        None,
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for stream in streams:
+        data = zlib.compress(stream)
+        page_no, contents_no = len(objects) + 1, len(objects) + 2
+        kids.append(b"%d 0 R" % page_no)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                       b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                       % (PAGE_WIDTH, PAGE_HEIGHT, contents_no))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+                       % (len(data), data))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out     = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ── pool and cache ────────────────────────────────────────────────
+_pool      = None
+_pool_lock = threading.Lock()
+_slots     = threading.BoundedSemaphore(PDF_RENDER_WORKERS + PDF_RENDER_QUEUE)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_RENDER_WORKERS,
+                                        mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        return _pool
+
+
+def _store_when_done(resume_id, digest, future):
+    """Done callback: keep a render nobody waited for, so a retry finds it."""
+    try:
+        store(resume_id, digest, "pdf", future.result())
+    except Exception as e:
+        print(f"PDF export error: {e}")
+
+
+def cached_pdf(resume_id, content):
+    """
+    (path, digest) of the PDF for this resume text, rendering it in the
+    pool and storing it first if needed. Raises UnsupportedText when the
+    text cannot be shown in the built-in fonts, RenderBusy when the pool
+    and its queue are full, and RenderTimeout (a RenderBusy) when the
+    render takes longer than PDF_RENDER_TIMEOUT.
+    """
+    # Checked before the cache, which may hold an older lossy render
+    if not can_render(content):
+        raise UnsupportedText("This resume has characters the PDF export cannot show.")
+
+    digest = content_digest(content)
+    path   = cache_path(resume_id, digest, "pdf")
+    if os.path.exists(path):
+        return path, digest
+
+    if not _slots.acquire(blocking=False):
+        raise RenderBusy("PDF export is busy, please try again in a moment.")
+    try:
+        future = _get_pool().submit(render_pdf, content)
+    except BaseException:
+        _slots.release()
+        raise
+    # A running render cannot be cancelled, so its slot is only freed
+    # when it really ends, not when this request stops waiting for it
+    future.add_done_callback(lambda _: _slots.release())
+
+    try:
+        data = future.result(timeout=PDF_RENDER_TIMEOUT)
+    except TimeoutError:
+        future.add_done_callback(partial(_store_when_done, resume_id, digest))
+        raise RenderTimeout("PDF export is taking longer than usual, please try again in a moment.")
+
+    # A concurrent request may have stored the same version meanwhile;
+    # the rename makes that harmless.
+    store(resume_id, digest, "pdf", data)
+    return path, digest
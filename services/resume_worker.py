@@ -0,0 +1,176 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from config import (POOL_START_METHOD, RESUME_WORKERS, RESUME_WORKER_POLL_SECONDS,
+                    RESUME_WORKER_STALE_SECONDS)
+from database.db import get_db
+from models.resume_cache import put_cached
+from nlp.resume_parser import parse_resume_file
+from services.uploads import sniff_extension
+
+# ══════════════════════════════════════════════════════════════════
+# SQLITE-BACKED RESUME QUEUE
+#
+# Uploads are stored and inserted into resumes with status 'pending'
+# (models.resume_model.queue_resume). A dispatcher thread in every app
+# process claims pending rows and hands them to a process pool; results
+# are written back and the row becomes 'done' or 'failed'. Claims are
+# atomic in SQLite, so several gunicorn workers can share the queue, and
+# rows whose claim went stale (worker died) are picked up again.
+# ══════════════════════════════════════════════════════════════════
+
+_pool     = None
+_inflight = set()
+_lock     = threading.Lock()
+_wakeup   = threading.Event()
+_started  = False
+
+
+def start():
+    """Start the dispatcher thread once per process; its first pass claims at once."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    _wakeup.set()
+    threading.Thread(target=_dispatch_loop, name="resume-worker", daemon=True).start()
+
+
+def notify():
+    """Tell the dispatcher a new resume is waiting."""
+    start()
+    _wakeup.set()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=RESUME_WORKERS,
+                                    mp_context=multiprocessing.get_context(POOL_START_METHOD))
+    return _pool
+
+
+CLAIM_SQL = """
+    SELECT id, source_path FROM resumes
+    WHERE status = 'pending'
+    ORDER BY id LIMIT ?
+"""
+
+
+def _claim(limit):
+    """Atomically move up to `limit` pending resumes to 'processing'."""
+    now = time.time()
+    conn = get_db()
+    cur  = conn.cursor()
+    try:
+        # Take the write lock before reading so two processes never claim the same row
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("""
+            UPDATE resumes SET status = 'pending'
+            WHERE status = 'processing' AND claimed_at < ?
+        """, (now - RESUME_WORKER_STALE_SECONDS,))
+        cur.execute(CLAIM_SQL, (limit,))
+        jobs = cur.fetchall()
+        cur.executemany(
+            "UPDATE resumes SET status = 'processing', claimed_at = ? WHERE id = ?",
+            [(now, resume_id) for resume_id, _ in jobs]
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return jobs
+
+
+def _dispatch_loop():
+    while True:
+        _wakeup.wait(RESUME_WORKER_POLL_SECONDS)
+        _wakeup.clear()
+
+        with _lock:
+            free = RESUME_WORKERS - len(_inflight)
+        if free <= 0:
+            continue
+
+        try:
+            jobs = _claim(free)
+        except Exception as e:
+            print(f"Resume worker claim error: {e}")
+            continue
+
+        for resume_id, source_path in jobs:
+            try:
+                file_ext = _file_ext(source_path)
+            except OSError as e:
+                _fail(resume_id, f"Uploaded file is missing: {e}")
+                continue
+            with _lock:
+                _inflight.add(resume_id)
+            try:
+                future = _get_pool().submit(parse_resume_file, source_path, file_ext)
+            except Exception as e:
+                # Pool is broken; the claim goes stale and is retried later
+                print(f"Resume worker submit error: {e}")
+                with _lock:
+                    _inflight.discard(resume_id)
+                continue
+            future.add_done_callback(partial(_finish, resume_id))
+
+
+def _finish(resume_id, future):
+    """Write a parse result back to its resume row (runs in the pool's thread)."""
+    try:
+        content, skills, ats = future.result()
+        if not content:
+            _fail(resume_id, "Could not extract text. Please try another format.")
+        else:
+            # The upload stays in the blob store, referenced by the row
+            _complete(resume_id, content, skills, ats)
+    except Exception as e:
+        print(f"Resume worker error: {e}")
+        _fail(resume_id, str(e))
+    finally:
+        with _lock:
+            _inflight.discard(resume_id)
+        _wakeup.set()
+
+
+def _complete(resume_id, content, skills, ats):
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE resumes
+            SET content = ?, skills = ?, ats_score = ?, ats_breakdown = ?,
+                status = 'done', error = NULL
+            WHERE id = ?
+        """, (content, json.dumps(skills), ats.score, ats.to_json(), resume_id))
+        cur.execute("SELECT source_sha256 FROM resumes WHERE id = ?", (resume_id,))
+        row = cur.fetchone()
+        conn.commit()
+
+    if row and row[0]:
+        put_cached(row[0], content, skills, ats)
+
+
+def _fail(resume_id, error):
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE resumes SET status = 'failed', error = ? WHERE id = ?",
+            (error, resume_id)
+        )
+        conn.commit()
+
+
+def _file_ext(source_path):
+    """Extension of the upload; blob paths have none, so sniff the content."""
+    name = os.path.basename(source_path)
+    if "." in name:
+        return name.rsplit('.', 1)[1].lower()
+    return sniff_extension(source_path)
@@ -0,0 +1,270 @@
+import json
+import os
+import threading
+import time
+
+from config import (BLOB_GC_GRACE_SECONDS, DOCX_CACHE_DIR, SWEEP_BATCH,
+                    SWEEP_HISTORY, SWEEP_INTERVAL_SECONDS)
+from database.db import connect, get_db
+from services import blob_store
+
+# ══════════════════════════════════════════════════════════════════
+# ORPHAN SWEEPER
+#
+# Deletes cascade through triggers (database/migrations.py, step 12),
+# but rows orphaned before those existed stay behind, and files are
+# only released, never removed, by a delete. A background thread in
+# every app process runs sweep() every SWEEP_INTERVAL_SECONDS; the run
+# is claimed in sweep_runs, so with several processes only one sweeps
+# per interval. Each pass:
+#
+#   1. deletes orphaned rows, SWEEP_BATCH per write transaction, so
+#      requests never wait long for the lock (the cascade and blob
+#      refcount triggers fire as usual);
+#   2. collects unreferenced blobs (services/blob_store.py);
+#   3. removes blob files without a row, abandoned upload temp files
+#      and cached renders of resumes that no longer exist.
+#
+# What it reclaimed is stored with the run and shown at
+# /admin/maintenance, where an admin can also ask for a sweep; it runs
+# in its own thread, not in the admin's request.
+# ══════════════════════════════════════════════════════════════════
+
+# (table, what makes a row an orphan), parents first so their cascades
+# have already run when the children are looked at. Rows with a NULL
+# owner are legacy data and left alone (NULL NOT IN (...) is not true).
+ORPHANS = (
+    ("jobs",             "company_id NOT IN (SELECT id FROM users)"),
+    ("applications",     "user_id NOT IN (SELECT id FROM users)"
+                         " OR job_id NOT IN (SELECT id FROM jobs)"),
+    ("resumes",          "user_id NOT IN (SELECT id FROM users)"),
+    ("notifications",    "user_id NOT IN (SELECT id FROM users)"),
+    ("company_details",  "user_id NOT IN (SELECT id FROM users)"),
+    ("user_preferences", "user_id NOT IN (SELECT id FROM users)"),
+)
+
+LAST_RUN_SQL = "SELECT started_ts FROM sweep_runs ORDER BY id DESC LIMIT 1"
+
+# A sweep an admin asks for is skipped if any run started this recently
+# (a double submit, or the background pass has only just run)
+REQUESTED_MIN_AGE = 60
+
+RECENT_RUNS_SQL = """
+    SELECT id, started_ts, duration_ms, report FROM sweep_runs
+    ORDER BY id DESC LIMIT ?
+"""
+
+_lock    = threading.Lock()
+_started = False
+
+
+# ── rows ──────────────────────────────────────────────────────────
+def orphan_ids_sql(table, orphaned):
+    """Next batch of orphan ids after ?, at most ? of them."""
+    return f"""
+        SELECT id FROM {table}
+        WHERE id > ? AND ({orphaned})
+        ORDER BY id LIMIT ?
+    """
+
+
+def delete_orphan_sql(table, orphaned):
+    """Delete row ? if it is still an orphan."""
+    return f"DELETE FROM {table} WHERE id = ? AND ({orphaned})"
+
+
+def _sweep_rows(conn, table, orphaned, batch):
+    """Delete the orphaned rows of table; returns their ids."""
+    find, delete = orphan_ids_sql(table, orphaned), delete_orphan_sql(table, orphaned)
+    cur = conn.cursor()
+    removed, after = [], 0
+    while True:
+        # Look them up without the write lock, re-check while deleting
+        cur.execute(find, (after, batch))
+        ids = [row[0] for row in cur.fetchall()]
+        if not ids:
+            return removed
+
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for row_id in ids:
+                cur.execute(delete, (row_id,))
+                if cur.rowcount:
+                    removed.append(row_id)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        after = ids[-1]
+
+
+def _forget_jobs(job_ids):
+    try:
+        from nlp.job_matcher import get_job_index
+        get_job_index().remove_jobs(job_ids)
+    except Exception as e:
+        print(f"Job index error: {e}")
+
+
+# ── files ─────────────────────────────────────────────────────────
+def live_resumes_sql(count):
+    """Which of count resume ids still exist."""
+    return f"SELECT id FROM resumes WHERE id IN ({', '.join('?' * count)})"
+
+
+def _collect_blobs(conn, batch):
+    removed, freed = 0, 0
+    while True:
+        count, size = blob_store.collect_garbage(conn, batch)
+        removed += count
+        freed   += size
+        if count < batch:
+            return removed, freed
+
+
+def _sweep_renders(conn, batch):
+    """Cached renders of deleted resumes, and abandoned render temp files."""
+    if not os.path.isdir(DOCX_CACHE_DIR):
+        return 0, 0
+
+    cutoff  = time.time() - BLOB_GC_GRACE_SECONDS
+    renders = {}   # resume id -> its cached files
+    doomed  = []
+    for entry in os.scandir(DOCX_CACHE_DIR):
+        prefix = entry.name.split("-", 1)[0]
+        if entry.name.endswith(".part"):
+            if entry.stat().st_mtime < cutoff:
+                doomed.append(entry)
+        elif prefix.isdigit():
+            renders.setdefault(int(prefix), []).append(entry)
+
+    cur = conn.cursor()
+    ids = list(renders)
+    for start in range(0, len(ids), batch):
+        chunk = ids[start:start + batch]
+        cur.execute(live_resumes_sql(len(chunk)), chunk)
+        live = {row[0] for row in cur.fetchall()}
+        doomed += [entry for resume_id in chunk if resume_id not in live
+                   for entry in renders[resume_id]]
+
+    removed, freed = 0, 0
+    for entry in doomed:
+        try:
+            size = entry.stat().st_size
+            os.remove(entry.path)
+        except OSError:
+            continue
+        removed += 1
+        freed   += size
+    return removed, freed
+
+
+# ── runs ──────────────────────────────────────────────────────────
+def _claim(conn, min_age):
+    """Log a new run and return its id, or None if one started less than min_age ago."""
+    now = int(time.time())
+    cur = conn.cursor()
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(LAST_RUN_SQL)
+        last = cur.fetchone()
+        if last and now - last[0] < min_age:
+            conn.rollback()
+            return None
+
+        cur.execute("""
+            INSERT INTO sweep_runs (started_ts, duration_ms, report)
+            VALUES (?, 0, '{}')
+        """, (now,))
+        run_id = cur.lastrowid
+        cur.execute("DELETE FROM sweep_runs WHERE id <= ?", (run_id - SWEEP_HISTORY,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return run_id
+
+
+def sweep(conn, min_age=0, batch=SWEEP_BATCH):
+    """
+    One full pass. Returns the report stored in sweep_runs:
+    {"rows": {table: count}, "files": {kind: count}, "bytes": freed},
+    or None if another run started less than min_age seconds ago.
+    Rows removed by cascades are not counted.
+    """
+    run_id = _claim(conn, min_age)
+    if run_id is None:
+        return None
+    started = time.time()
+
+    rows = {}
+    for table, orphaned in ORPHANS:
+        ids = _sweep_rows(conn, table, orphaned, batch)
+        rows[table] = len(ids)
+        if table == "jobs" and ids:
+            _forget_jobs(ids)
+
+    files, freed = {}, 0
+    for kind, (count, size) in (
+            ("blobs",         _collect_blobs(conn, batch)),
+            ("orphan blobs",  blob_store.remove_orphan_files(conn, batch)),
+            ("upload temp",   blob_store.remove_stale_temp()),
+            ("renders",       _sweep_renders(conn, batch))):
+        files[kind] = count
+        freed      += size
+
+    report = {"rows": rows, "files": files, "bytes": freed}
+    with conn:
+        conn.execute(
+            "UPDATE sweep_runs SET duration_ms = ?, report = ? WHERE id = ?",
+            (int((time.time() - started) * 1000), json.dumps(report), run_id)
+        )
+
+    if any(rows.values()) or any(files.values()):
+        print(f"🧹 Sweep reclaimed {sum(rows.values())} rows, "
+              f"{sum(files.values())} files, {freed} bytes")
+    return report
+
+
+def recent_runs(conn, limit=SWEEP_HISTORY):
+    """Latest runs, newest first, with their reports decoded."""
+    cur = conn.cursor()
+    cur.execute(RECENT_RUNS_SQL, (limit,))
+    return [dict(row, report=json.loads(row["report"])) for row in cur.fetchall()]
+
+
+# ── background thread ─────────────────────────────────────────────
+def _sweep_loop():
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            # Half an interval: every process wakes once per interval, at
+            # different times, and the first one due does the sweep
+            sweep(get_db(), min_age=SWEEP_INTERVAL_SECONDS // 2)
+        except Exception as e:
+            print(f"Sweeper error: {e}")
+
+
+def _requested_sweep():
+    conn = connect()
+    try:
+        sweep(conn, min_age=REQUESTED_MIN_AGE)
+    except Exception as e:
+        print(f"Sweeper error: {e}")
+    finally:
+        conn.close()
+
+
+def request_sweep():
+    """Sweep now in a background thread (POST /admin/maintenance/sweep)."""
+    threading.Thread(target=_requested_sweep, name="sweeper-requested", daemon=True).start()
+
+
+def start():
+    """Start the sweeper thread once per process; the first pass is one interval in."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_sweep_loop, name="sweeper", daemon=True).start()
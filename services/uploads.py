@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+
+from config import MAX_CONTENT_LENGTH
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes every accepted file type must start with (DOCX is a zip)
+MAGIC_BYTES = {
+    'pdf':  (b'%PDF-',),
+    'docx': (b'PK\x03\x04',),
+}
+
+
+class UploadError(ValueError):
+    """Upload rejected; the message is safe to show to the user."""
+
+
+def _check_magic(head, file_ext):
+    if file_ext in MAGIC_BYTES:
+        if not head.startswith(MAGIC_BYTES[file_ext]):
+            raise UploadError(f"⚠️ File content is not a valid {file_ext.upper()}.")
+    elif b'\x00' in head:
+        raise UploadError("⚠️ Text resumes must be plain text.")
+
+
+def store_upload(file_storage, dest_dir, file_ext, max_bytes=MAX_CONTENT_LENGTH):
+    """
+    Stream an uploaded file into a temp file inside dest_dir in fixed-size
+    chunks, hashing as it goes, without holding the upload in memory.
+
+    The first chunk is checked against MAGIC_BYTES for file_ext. Returns
+    (temp_path, sha256_hex, size); the caller renames temp_path into place
+    (or removes it). Raises UploadError for empty, oversized or mistyped files.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=dest_dir, suffix=".part")
+
+    digest = hashlib.sha256()
+    size   = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            stream = file_storage.stream
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0:
+                    _check_magic(chunk, file_ext)
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError("⚠️ File is too large.")
+                digest.update(chunk)
+                out.write(chunk)
+
+        if size == 0:
+            raise UploadError("⚠️ Uploaded file is empty.")
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return temp_path, digest.hexdigest(), size
+
+
+def sniff_extension(path):
+    """
+    Type of a stored upload from its leading bytes: a key of MAGIC_BYTES,
+    or "txt". Blob files carry no extension of their own.
+    """
+    with open(path, "rb") as f:
+        head = f.read(8)
+    for file_ext, magic in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return file_ext
+    return "txt"
@@ -0,0 +1,101 @@
+import threading
+import time
+
+# ══════════════════════════════════════════════════════════════════
+# WORKER WARM-UP
+#
+# The skill taxonomy, the job index (numpy/scipy/scikit-learn) and the
+# python-docx template are all loaded on first use, so importing the app
+# stays cheap. Left alone, the first request to need one of them would
+# pay for the load. create_app() starts warm_up() in a background thread instead,
+# and /ready answers 503 until every step has finished, so a load
+# balancer only sends traffic to warm workers.
+# ══════════════════════════════════════════════════════════════════
+
+SAMPLE_RESUME = """
+Jane Doe - jane@example.com - (555) 123-4567
+Summary: Software engineer. Skills: Python, Flask, SQL, machine learning.
+Experience: Developed and launched APIs; reduced latency by 40%.
+Education: BSc Computer Science, State University.
+"""
+
+
+def _skill_taxonomy():
+    from nlp.skill_extractor import extract_skills
+    extract_skills(SAMPLE_RESUME)
+
+
+def _ats_scorer():
+    from nlp.ats_scorer import score_resume
+    score_resume(SAMPLE_RESUME)
+
+
+def _job_index():
+    from nlp.job_matcher import get_job_index
+    get_job_index().top_k(SAMPLE_RESUME, 1)
+
+
+def _docx():
+    from services.resume_docx import base_document
+    base_document()
+
+
+# (name, step), run in order
+STEPS = (
+    ("skill taxonomy", _skill_taxonomy),
+    ("ATS scorer",     _ats_scorer),
+    ("job index",      _job_index),
+    ("docx",           _docx),
+)
+
+_lock     = threading.Lock()
+_started  = False
+_done     = threading.Event()
+_timings  = {}   # step name -> milliseconds
+_errors   = {}   # step name -> error message
+
+
+def warm_up():
+    """Run every step, recording how long each took or why it failed."""
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            _errors[name] = f"{type(e).__name__}: {e}"
+            print(f"Warm-up: {name} failed: {e}")
+            continue
+        _timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        print(f"Warm-up: {name} ready in {_timings[name]:.0f} ms")
+    _done.set()
+
+
+def start():
+    """Start warming up in a background thread, once per process."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
+def is_ready():
+    """
+    True once every step has run without error. A process that never
+    started warming up (WARM_UP off) loads things on demand and is ready.
+    """
+    if not _started:
+        return True
+    return _done.is_set() and not _errors
+
+
+def status():
+    """Readiness report for the /ready endpoint."""
+    return {
+        "ready":     is_ready(),
+        "started":   _started,
+        "pending":   [name for name, _ in STEPS if name not in _timings and name not in _errors],
+        "timings_ms": dict(_timings),
+        "errors":    dict(_errors),
+    }
@@ -0,0 +1,9 @@
+"""
+WSGI entry point: gunicorn wsgi:app
+
+Building the app migrates the database and starts the warm-up and
+sweeper threads, so it happens here rather than on "import app".
+"""
+from app import create_app
+
+app = create_app()